@@ -17,18 +17,12 @@ project receive.
 import os
 
 # data manipulation
+from functools import lru_cache
 import numpy as np
 
-# visualization packages
-import matplotlib.pyplot as plt
-
 # define variables that will be used throughout script
 SCRIPT_DIR = os.path.dirname(__file__)
 
-RANDOM_FIG, RANDOM_AX = plt.subplots()
-RANDOM_FIG.clear()
-AXES_TYPE = type(RANDOM_AX)
-
 
 ################################
 ### Define Modular Functions ###
@@ -69,21 +63,64 @@ def id_checker(id_to_check: int, verbose=1) -> None:
     1. https://docs.python.org/3/tutorial/errors.html
     """
     try:
-        integer_check = [isinstance(id_to_check, int),
-                         isinstance(id_to_check, np.int),
-                         isinstance(id_to_check, np.int0),
-                         isinstance(id_to_check, np.int8),
-                         isinstance(id_to_check, np.int16),
-                         isinstance(id_to_check, np.int32),
-                         isinstance(id_to_check, np.int64),
-                         isinstance(id_to_check, np.int_),
-                         isinstance(id_to_check, np.integer)]
-        assert any(integer_check)
+        assert isinstance(id_to_check, (int, np.integer))
         assert id_to_check > 0
     except AssertionError as ass_err:
-        error_msg = "Invalid input to function. The argument passed in\
-		must be non-zero integer. Received type \
-		`{}` and value `{}`.".format(type(id_to_check), id_to_check)
+        error_msg = ("Invalid input to function. The argument passed in "
+                     "must be non-zero integer. Received type "
+                     f"`{type(id_to_check)}` and value `{id_to_check}`.")
+
+        if verbose:
+            print(error_msg)
+        raise ass_err
+
+
+def id_checker_batch(ids_to_check: np.ndarray, verbose=1) -> None:
+    """
+    Purpose
+    -------
+    The purpose of this function is to run the same validation tests that
+    `id_checker` runs, but on an entire Numpy Array of IDs at once. This
+    allows callers that would otherwise loop over a collection of IDs and
+    call `id_checker` on each one to instead do a single check whose work
+    is done by Numpy.
+
+    Parameters
+    ----------
+    ids_to_check : Numpy Array
+        This argument allows the user to specify the collection of IDs
+        that are to be validated.
+    verbose : int
+        This argument allows the user to specify whether or not the
+        function will print out an error message detailing the error that
+        it raises.
+
+    Returns
+    -------
+    to_return : None
+        This function does not return anything regardless of how the
+        argument `ids_to_check` does in the tests done by this function.
+
+    Raises
+    ------
+    AssertionError
+        This type of error is raised when either the user passes in
+        something other than a non-empty Numpy Array of integers or at
+        least one of the IDs is a non-positive integer.
+
+    References
+    ----------
+    1. https://numpy.org/doc/stable/reference/generated/numpy.dtype.kind.html
+    """
+    try:
+        assert isinstance(ids_to_check, np.ndarray)
+        assert ids_to_check.dtype.kind in "iu"
+        assert ids_to_check.size > 0
+        assert ids_to_check.min() > 0
+    except AssertionError as ass_err:
+        error_msg = ("Invalid input to function. The argument passed in "
+                     "must be a non-empty Numpy Array of non-zero integers. "
+                     f"Received type `{type(ids_to_check)}`.")
 
         if verbose:
             print(error_msg)
@@ -130,19 +167,18 @@ def error_message_generator(
         passes in an object whose type is not among the accepted types
         for that parameter.
     """
-    to_return = None
     # First, validate the input data.
     received_type = type(parameter_var)
     try:
         if isinstance(expected_type, tuple):
-            assert all([t != received_type for t in expected_type])
+            assert received_type not in expected_type
         else:
             assert received_type != expected_type
     except AssertionError:
-        err_msg = "The type of the object passed-in to the parameter of\
-		interest is identical to the expected type for this parameter.\
-		This function should only be called when these two Python types\
-		are different."
+        err_msg = ("The type of the object passed-in to the parameter of "
+                   "interest is identical to the expected type for this "
+                   "parameter. This function should only be called when "
+                   "these two Python types are different.")
 
         print(err_msg)
         raise ValueError
@@ -156,19 +192,53 @@ def error_message_generator(
     if isinstance(parameter_name, str):
         # If we were able to successfully create a string that contains
         # the name of the parameter of interest.
-        err_msg = "The received type for the parameter of interest, `{}`,\
-		is: `{}`. Note that this function only accepts objects of type(s):\
-		{}".format(parameter_name, received_type, expected_type)
+        err_msg = ("The received type for the parameter of interest, "
+                   f"`{parameter_name}`, is: `{received_type}`. Note that "
+                   "this function only accepts objects of type(s): "
+                   f"{expected_type}")
     else:
         # If we were NOT able to successfully create a string that contains
         # the name of the parameter of interest.
-        err_msg = "The received type for the parameter of interest is: \
-		`{}`. Note that this function only accepts objects of type(s):\
-		{}".format(received_type, expected_type)
+        err_msg = ("The received type for the parameter of interest is: "
+                   f"`{received_type}`. Note that this function only accepts "
+                   f"objects of type(s): {expected_type}")
+
+    return err_msg
+
+
+@lru_cache(maxsize=256)
+def _type_ok(received_type: type, expected_type) -> bool:
+    """
+    Purpose
+    -------
+    The purpose of this function is to determine whether or not an object
+    of type `received_type` is an instance of the type(s) specified by
+    `expected_type`. The result is cached on the pair of types since
+    `parameter_type_validator` sees the same handful of type pairs over
+    and over again.
 
-    to_return = err_msg
+    Parameters
+    ----------
+    received_type : Python type object
+        This argument allows the user to specify the type of the object
+        passed in to the parameter of interest.
+    expected_type : Python type objects or tuple of types
+        This argument allows the user to specify the type(s) of the object
+        for the parameter of interest that are accepted.
 
-    return to_return
+    Returns
+    -------
+    to_return : bool
+        This function returns `True` if the received type is among the
+        accepted types and `False` otherwise.
+
+    References
+    ----------
+    1. https://docs.python.org/3/library/functools.html#functools.lru_cache
+    """
+    if isinstance(expected_type, (type, tuple)):
+        return issubclass(received_type, expected_type)
+    return False
 
 
 def parameter_type_validator(expected_type: type, parameter_var: object):
@@ -205,26 +275,53 @@ def parameter_type_validator(expected_type: type, parameter_var: object):
     ----------
     1. https://docs.python.org/3/tutorial/errors.html
     """
-    to_return = None
-    # Next, determine if the received type is an accepted one.
-    try:
-        # Begin by trying to tell Python that the two types have to be
-        # identical. In the event that the parameter of interest accepts
-        # multiple types, we will only assert that one of these accepted
-        # types is identical to the received type.
-        if isinstance(expected_type, tuple):
-            # If there are multiple types that the parameter of interest
-            # accepts.
-            assert any([
-                isinstance(parameter_var, t) for t in expected_type
-            ])
-        else:
-            # If the parameter of interest only accepts one specific type.
-            assert isinstance(parameter_var, expected_type)
-    except AssertionError:
+    # Next, determine if the received type is an accepted one. Note that
+    # the outcome of this check only depends on the type of the received
+    # object, so it is looked up in (or added to) a cache of previously
+    # seen type pairs.
+    if not _type_ok(type(parameter_var), expected_type):
         # If the user did NOT pass in an object of the correct type.
         err_msg = error_message_generator(expected_type, parameter_var)
 
         raise ValueError(err_msg)
 
-    return to_return
+
+def parameter_types_validator(type_specs) -> None:
+    """
+    Purpose
+    -------
+    The purpose of this function is to run the same check that
+    `parameter_type_validator` runs on several parameters at once. This
+    allows functions that validate many parameters to do so with a single
+    call instead of one call per parameter.
+
+    Parameters
+    ----------
+    type_specs : iterable of tuples
+        This argument allows the user to specify the parameters to check.
+        Each element must be a tuple of the form
+        `(expected_type, parameter_var)` where these two values have the
+        same meaning as the identically named parameters of
+        `parameter_type_validator`.
+
+    Returns
+    -------
+    to_return : None
+        This function does not return anything since it is only determining
+        if it will raise a ValueError in the event that the user passed-in
+        an object whose type is not among the accepted types for at least
+        one of the parameters of interest.
+
+    Raises
+    ------
+    ValueError
+        This error is raised when the user, for at least one parameter,
+        passes in an object whose type is not among the accepted types
+        for that parameter.
+    """
+    for expected_type, parameter_var in type_specs:
+        if not _type_ok(type(parameter_var), expected_type):
+            # If the user did NOT pass in an object of the correct type.
+            err_msg = error_message_generator(expected_type, parameter_var)
+
+            raise ValueError(err_msg)
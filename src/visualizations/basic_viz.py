@@ -14,16 +14,34 @@ contained in this project.
 ###################################
 # file access
 import os
+import sys
+from collections import OrderedDict
+from hashlib import blake2b
+from pathlib import Path
 
 # data manipulation
+from operator import itemgetter
 import numpy as np
 import pandas as pd
 
 # visualization packages
+import matplotlib
+# Unless the user is working in an interactive session (where figures need
+# to be displayed) or has explicitly picked a backend via the `MPLBACKEND`
+# environment variable, use the non-interactive Agg backend since these
+# plots are only written to disk.
+if "MPLBACKEND" not in os.environ and not hasattr(sys, "ps1") \
+        and "ipykernel" not in sys.modules:
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-import plotly.express as px
+from matplotlib.axes import Axes as AXES_TYPE
+from matplotlib.colors import Normalize
+from matplotlib.lines import Line2D
+import plotly.graph_objs as go
+from plotly.graph_objs import Figure as PLOTLY_FIG_TYPE
 
 # ML-related packages
+from joblib import Memory
 from sklearn.manifold import TSNE
 
 # custom modules
@@ -31,12 +49,50 @@ from src.test import input_parameter_validation as ipv
 
 # define variables that will be used throughout script
 SCRIPT_DIR = os.path.dirname(__file__)
-
-RANDOM_FIG, RANDOM_AX = plt.subplots()
-RANDOM_FIG.clear()
-AXES_TYPE = type(RANDOM_AX)
-
-RANDOM_PLOTLY_BAR_OBJ = px.bar()
+PLOT_DIR = Path(SCRIPT_DIR, "../../visualizations").resolve()
+
+TSNE_MEMORY = Memory(os.path.join(SCRIPT_DIR, "../../cache/tsne"), verbose=0)
+TSNE_SESSION_CACHE = OrderedDict()  # hash of feature data -> TSNE embedding
+TSNE_SESSION_CACHE_SIZE = 4
+
+# maximum number of data instances displayed in each cluster scatter plot.
+MAX_SCATTER_POINTS = 20_000
+# minimum number of data instances for which a TSNE embedding is computed.
+MIN_TSNE_POINTS = 500
+
+# subplots of `cluster_subplot_generator` that display one feature against
+# another. Each entry gives the `(row, column)` of the subplot, the column
+# indices of the x and y features, and their axis labels.
+CLUSTER_SCATTER_PANELS = [
+    ((0, 0), 0, 1, "Time in Match", "Score Differential"),
+    ((0, 1), 0, 6, "Time in Match", r"$\Delta$ Position Dist."),
+    ((1, 0), 0, 7, "Time in Match", r"$\Delta$ To Goal Dist."),
+    ((1, 1), 1, 6, "Score Differential", r"$\Delta$ Position Dist."),
+    ((2, 0), 1, 7, "Score Differential", r"$\Delta$ To Goal Dist."),
+    ((2, 1), 7, 6, r"$\Delta$ To Goal Dist.", r"$\Delta$ Position Dist."),
+    ((3, 0), 8, 9, "No. Attacking Events", r"Max-Avg. $\Delta$ Dists.")
+]
+
+# styling shared by every bar chart created by `plotly_bar_chart`.
+PLOTLY_FONT = {"family": "Times New Roman", "size": 18, "color": "black"}
+PLOTLY_MARKER = {"marker_color": "rgb(195, 62, 227)",
+                 "marker_line_color": "rgb(0, 0, 0)",
+                 "marker_line_width": .75}
+PLOTLY_TITLE_BASE = {"y": 0.965, "x": 0.5,
+                     "xanchor": "center", "yanchor": "top"}
+
+# tick mark settings applied to every `axis` object created by `create_graph`
+# and by `adjust_plot_ticks` (which applies them to an existing `axis`).
+TICK_RC_PARAMS = {"xtick.direction": "in",
+                  "ytick.direction": "in",
+                  "xtick.top": True,
+                  "ytick.right": True,
+                  "xtick.major.size": 7,
+                  "ytick.major.size": 7,
+                  "xtick.minor.size": 3,
+                  "ytick.minor.size": 3,
+                  "xtick.minor.visible": True,
+                  "ytick.minor.visible": True}
 
 
 ################################
@@ -69,28 +125,26 @@ def adjust_plot_ticks(axes_obj: AXES_TYPE) -> AXES_TYPE:
         passes in an object whose type is not among the accepted types
         for that parameter.
     """
-    to_return = None
     # First, validate the input data.
     ipv.parameter_type_validator(expected_type=AXES_TYPE,
                                  parameter_var=axes_obj)
 
-    # Next, update the tick mark attributes of the received `axis` object.
+    # Next, update the tick mark attributes of the received `axis` object
+    # with the same settings that `create_graph` uses (see
+    # `TICK_RC_PARAMS`).
     axes_obj.minorticks_on()
-    axes_obj.tick_params(axis="both",
-                         which="major",
-                         direction="in",
-                         top=True,
-                         right=True,
-                         length=7)
-    axes_obj.tick_params(axis="both",
-                         which="minor",
-                         direction="in",
-                         top=True,
-                         right=True,
-                         length=3)
-    to_return = axes_obj
-
-    return to_return
+    for axis, far_side in (("x", "top"), ("y", "right")):
+        for which in ("major", "minor"):
+            axes_obj.tick_params(
+                axis=axis,
+                which=which,
+                direction=TICK_RC_PARAMS["{}tick.direction".format(axis)],
+                length=TICK_RC_PARAMS["{}tick.{}.size".format(axis, which)],
+                **{far_side: TICK_RC_PARAMS["{}tick.{}".format(axis,
+                                                               far_side)]}
+            )
+
+    return axes_obj
 
 
 def create_graph(figure_size=None, nrow=1, ncol=1) -> tuple:
@@ -141,8 +195,8 @@ def create_graph(figure_size=None, nrow=1, ncol=1) -> tuple:
     1. https://matplotlib.org/3.3.3/api/_as_gen/matplotlib.axes.Axes.tick_params.html
     2. https://matplotlib.org/3.3.3/api/_as_gen/matplotlib.pyplot.subplots.html
     3. https://stackoverflow.com/questions/6541123/improve-subplot-size-spacing-with-many-subplots-in-matplotlib
+    4. https://matplotlib.org/3.3.3/api/_as_gen/matplotlib.pyplot.rc_context.html
     """
-    to_return = None
     # First, validate the input data
     ipv.parameter_type_validator(expected_type=(type(None), tuple),
                                  parameter_var=figure_size)
@@ -152,33 +206,27 @@ def create_graph(figure_size=None, nrow=1, ncol=1) -> tuple:
     # Next, instantiate the figure and axes objects.
     figsize = (21, 10) if isinstance(figure_size, type(None)) \
         else figure_size
-    fig, axes = plt.subplots(figsize=figsize, nrows=nrow, ncols=ncol)
-
-    # Pretty up the graph's appearance.
-    fig.subplots_adjust(hspace=0.275, wspace=0.075)
-
-    if isinstance(axes, AXES_TYPE):
-        adjust_plot_ticks(axes_obj=axes)
-    else:
-        if all([nrow > 1, ncol > 1]):
-            assert axes.shape == (nrow, ncol)
-            for i in range(axes.shape[0]):
-                for j in range(axes.shape[1]):
-                    adjust_plot_ticks(axes_obj=axes[i, j])
-        else:
-            for i in range(axes.size):
-                adjust_plot_ticks(axes_obj=axes[i])
+    # Note that the tick mark attributes (set through a temporary set of
+    # rcParams) and the spacing between subplots are given up front so that
+    # each `axis` object is created with them instead of having to update
+    # every `axis` object after the fact.
+    with plt.rc_context(TICK_RC_PARAMS):
+        fig, axes = plt.subplots(
+            figsize=figsize,
+            nrows=nrow,
+            ncols=ncol,
+            gridspec_kw={"hspace": 0.275, "wspace": 0.075}
+        )
 
     # Return result
-    to_return = (fig, axes)
-
-    return to_return
+    return fig, axes
 
 
 def add_scatter_to_ax_obj(
         ax_obj: AXES_TYPE, x_data: np.array, y_data: np.array,
         color_arr: np.array, x_lab: str, y_lab: str,
-        title_lab: str) -> AXES_TYPE:
+        title_lab: str, legend_elements=None, draw_legend=True,
+        _internal=False) -> AXES_TYPE:
     """
     Purpose
     -------
@@ -197,14 +245,19 @@ def add_scatter_to_ax_obj(
         for this function to use to create their scatter plot.
     x_data : Numpy Array
         This parameter allows the user to specify the data that they would
-        like the be displayed along the x-axis.
+        like the be displayed along the x-axis. This must be a
+        1-dimensional array.
     y_data : Numpy Array
         This parameter allows the user to specify the data that they would
-        like the be displayed along the y-axis.
+        like the be displayed along the y-axis. This must be a
+        1-dimensional array.
     color_arr : Numpy Array
         This parameter allows the user to specify the class labels for each
         data instance in `x_data` and `y_data` that will be used to specify
-        the color of each data point in the scatter plot.
+        the color of each data point in the scatter plot. Alternatively,
+        this can be an already color-mapped array of RGBA values (one row
+        per data instance); see `_cluster_colors`. In this case, the
+        `legend_elements` parameter must also be specified.
     x_lab : str
         This parameter allows the user to specify the label they would like
         to be used for the x-axis.
@@ -214,6 +267,26 @@ def add_scatter_to_ax_obj(
     title_lab : str
         This parameter allows the user to specify the label they would like
         to be used for the entire graph.
+    legend_elements : None or tuple
+        This parameter allows the user to specify the legend handles and
+        labels (in the form returned by `_cluster_colors`) to use for the
+        legend of the scatter plot.
+
+        This parameter defaults to `None` in which case the legend entries
+        are generated from the scatter plot itself.
+    draw_legend : bool
+        This parameter allows the user to specify whether or not a legend
+        is drawn on this axis. Callers that place several scatter plots of
+        the same classes in one figure can set this to `False` and draw a
+        single figure-level legend instead.
+
+        This parameter defaults to `True`.
+    _internal : bool
+        This parameter is only meant to be set by other functions in this
+        script that have already validated the data they pass in. When it
+        is `True`, the validation of the other parameters is skipped.
+
+        This parameter defaults to `False`.
 
     Returns
     -------
@@ -228,6 +301,9 @@ def add_scatter_to_ax_obj(
         This error is raised when the user, for at least one parameter,
         passes in an object whose type is not among the accepted types
         for that parameter.
+    AssertionError
+        This error is raised when either `x_data` or `y_data` is not a
+        1-dimensional array.
 
     References
     ----------
@@ -235,31 +311,37 @@ def add_scatter_to_ax_obj(
     2. https://matplotlib.org/3.1.1/api/_as_gen/matplotlib.pyplot.legend.html
     3. https://matplotlib.org/3.3.3/api/_as_gen/matplotlib.pyplot.scatter.html
     """
-    ipv.parameter_type_validator(expected_type=AXES_TYPE, parameter_var=ax_obj)
-    ipv.parameter_type_validator(expected_type=np.ndarray,
-                                 parameter_var=x_data)
-    ipv.parameter_type_validator(expected_type=np.ndarray,
-                                 parameter_var=y_data)
-    ipv.parameter_type_validator(expected_type=np.ndarray,
-                                 parameter_var=color_arr)
-    ipv.parameter_type_validator(expected_type=str, parameter_var=x_lab)
-    ipv.parameter_type_validator(expected_type=str, parameter_var=y_lab)
-    ipv.parameter_type_validator(expected_type=str, parameter_var=title_lab)
+    if not _internal:
+        # If the function is NOT being called by another function in this
+        # script that already validated its input data.
+        ipv.parameter_types_validator([
+            (AXES_TYPE, ax_obj),
+            (np.ndarray, x_data),
+            (np.ndarray, y_data),
+            (np.ndarray, color_arr),
+            (str, x_lab),
+            (str, y_lab),
+            (str, title_lab),
+            ((type(None), tuple), legend_elements),
+            (bool, draw_legend)
+        ])
 
     # Next, plot the given data
-    scatter_obj = ax_obj.scatter(
-        x_data.flatten(),
-        y_data.flatten(),
-        c=color_arr)
-
-    # Now, create a legend.
-    ax_obj.legend(*scatter_obj.legend_elements(),
-                  loc="best",
-                  title="Predicted Class",
-                  title_fontsize=15,
-                  fontsize="x-large",
-                  frameon=False,
-                  ncol=2)
+    assert x_data.ndim == 1 and y_data.ndim == 1
+    scatter_obj = ax_obj.scatter(x_data, y_data, c=color_arr)
+
+    # Now, create a legend if specified by the user.
+    if draw_legend:
+        if isinstance(legend_elements, type(None)):
+            # If the user did NOT specify the legend entries to use.
+            legend_elements = scatter_obj.legend_elements()
+        ax_obj.legend(*legend_elements,
+                      loc="best",
+                      title="Predicted Class",
+                      title_fontsize=15,
+                      fontsize="x-large",
+                      frameon=False,
+                      ncol=2)
 
     # Now add the specified labels.
     ax_obj.set_title(label=title_lab, size=22, pad=10)
@@ -267,9 +349,145 @@ def add_scatter_to_ax_obj(
     ax_obj.set_xlabel(xlabel=x_lab, size=17, labelpad=3)
 
     # Return the updated axes
-    to_return = ax_obj
+    return ax_obj
+
+
+def _cluster_colors(predicted_labels: np.ndarray) -> tuple:
+    """
+    Purpose
+    -------
+    The purpose of this function is to map the class labels of each data
+    instance to the color used to display it in a scatter plot (the same
+    colors `scatter` would produce from the labels themselves) along with
+    the legend entries for each class. This allows a caller that makes
+    several scatter plots of the same class labels to do this work once
+    instead of once per plot.
+
+    Parameters
+    ----------
+    predicted_labels : Numpy Array
+        This argument allows the user to specify the class label of each
+        data instance.
+
+    Returns
+    -------
+    to_return : tuple
+        This function returns a tuple that contains two elements:
+            1. A Numpy Array of RGBA values with one row per data instance.
+            2. A tuple of the legend handles and legend labels for each
+               unique class label.
+
+    References
+    ----------
+    1. https://matplotlib.org/3.3.3/tutorials/colors/colormapnorms.html
+    2. https://matplotlib.org/3.3.3/gallery/text_labels_and_annotations/custom_legends.html
+    """
+    cmap = plt.get_cmap(plt.rcParams["image.cmap"])
+    norm = Normalize(vmin=predicted_labels.min(), vmax=predicted_labels.max())
+    point_colors = cmap(norm(predicted_labels))
+
+    class_labels = np.unique(predicted_labels)
+    legend_handles = [
+        Line2D([], [], linestyle="", marker="o", color=cmap(norm(label)))
+        for label in class_labels
+    ]
+
+    return point_colors, (legend_handles, [str(lab) for lab in class_labels])
+
+
+@TSNE_MEMORY.cache
+def _fit_tsne(feat_data: np.ndarray, seed=1169) -> np.ndarray:
+    """
+    Purpose
+    -------
+    The purpose of this function is to compute the 2-component TSNE
+    embedding of the given feature data. Since TSNE is deterministic for a
+    fixed random state, the result is persisted to disk (keyed on the
+    contents of `feat_data` and `seed`) so that repeat calls with the same
+    data load the embedding instead of recomputing it.
+
+    Parameters
+    ----------
+    feat_data : Numpy Array
+        This argument allows the user to specify the feature data that
+        will be embedded.
+    seed : int
+        This argument allows the user to specify the random state used by
+        the TSNE transformer.
+
+        This parameter defaults to `1169`.
+
+    Returns
+    -------
+    to_return : Numpy Array
+        This function returns the embedded feature data which has a shape
+        of `(feat_data.shape[0], 2)`.
 
-    return to_return
+    References
+    ----------
+    1. https://joblib.readthedocs.io/en/latest/memory.html
+    """
+    # Initializing with PCA and scaling the perplexity down for smaller data
+    # sets allows the Barnes-Hut optimization to converge in fewer
+    # iterations.
+    tsne_transformer = TSNE(
+        n_components=2,
+        random_state=seed,
+        n_jobs=-1,
+        init="pca",
+        method="barnes_hut",
+        perplexity=min(30.0, max(5.0, feat_data.shape[0] / 500))
+    )
+    return tsne_transformer.fit_transform(feat_data)
+
+
+def _tsne_cached(feat_data: np.ndarray) -> np.ndarray:
+    """
+    Purpose
+    -------
+    The purpose of this function is to return the TSNE embedding of the
+    given feature data while keeping the most recently used embeddings in
+    memory. This avoids even having to read a previously computed
+    embedding back from disk (see `_fit_tsne`) when the same subplot is
+    re-generated several times in one session. Once
+    `TSNE_SESSION_CACHE_SIZE` embeddings are held, the least recently used
+    one is evicted.
+
+    Parameters
+    ----------
+    feat_data : Numpy Array
+        This argument allows the user to specify the feature data that
+        will be embedded.
+
+    Returns
+    -------
+    to_return : Numpy Array
+        This function returns the embedded feature data which has a shape
+        of `(feat_data.shape[0], 2)`. Since this array is shared with the
+        cache, it is read-only.
+
+    References
+    ----------
+    1. https://docs.python.org/3/library/hashlib.html#blake2
+    2. https://docs.python.org/3/library/collections.html#collections.OrderedDict
+    """
+    data_key = (feat_data.shape, feat_data.dtype.str, blake2b(
+        np.ascontiguousarray(feat_data).tobytes(), digest_size=16
+    ).hexdigest())
+
+    if data_key in TSNE_SESSION_CACHE:
+        # If this embedding has already been computed in this session, mark
+        # it as the most recently used one.
+        TSNE_SESSION_CACHE.move_to_end(data_key)
+    else:
+        if len(TSNE_SESSION_CACHE) >= TSNE_SESSION_CACHE_SIZE:
+            # Evict the least recently used embedding.
+            TSNE_SESSION_CACHE.popitem(last=False)
+        features_embedded = _fit_tsne(feat_data)
+        features_embedded.setflags(write=False)
+        TSNE_SESSION_CACHE[data_key] = features_embedded
+
+    return TSNE_SESSION_CACHE[data_key]
 
 
 def cluster_subplot_generator(
@@ -289,6 +507,9 @@ def cluster_subplot_generator(
         This argument allows the user to specify the collection of data
         used to train the model whose class predictions are specified to
         the `predicted_labels` argument.
+
+        Note that if there are more than `MAX_SCATTER_POINTS` data
+        instances, only a random subset of that size is displayed.
     predicted_labels: Numpy Array
         This argument allows the user to specify the collection of class
         predictions that correspond to the training data specified to the
@@ -302,7 +523,8 @@ def cluster_subplot_generator(
         will be used.
     save_plot : Boolean
         This argument allows the user to specify whether or not the function
-        will save the plot that it generates.
+        will save the plot that it generates. A saved figure is not
+        displayed.
 
         This parameter defaults to `False`.
     **kwargs : dict
@@ -334,155 +556,140 @@ def cluster_subplot_generator(
     References
     ----------
     1. https://scikit-learn.org/stable/modules/generated/sklearn.manifold.TSNE.html
-    2. https://numpy.org/doc/stable/reference/random/generated/numpy.random.choice.html
+    2. https://numpy.org/doc/stable/reference/random/generated/numpy.random.Generator.choice.html
     3. https://matplotlib.org/3.1.1/api/_as_gen/matplotlib.pyplot.savefig.html
     4. https://stackoverflow.com/questions/9622163/save-plot-to-image-file-instead-of-displaying-it-using-matplotlib
     """
-    to_return = None
-
     # First, validate the input data.
-    ipv.parameter_type_validator(expected_type=np.ndarray,
-                                 parameter_var=feature_data)
-    ipv.parameter_type_validator(expected_type=np.ndarray,
-                                 parameter_var=predicted_labels)
-    ipv.parameter_type_validator(expected_type=(type(None), tuple),
-                                 parameter_var=plot_objs)
-    ipv.parameter_type_validator(expected_type=bool, 
-                                 parameter_var=save_plot)
+    ipv.parameter_types_validator([
+        (np.ndarray, feature_data),
+        (np.ndarray, predicted_labels),
+        ((type(None), tuple), plot_objs),
+        (bool, save_plot)
+    ])
 
     # Next, define necessary variables
     if isinstance(plot_objs, type(None)):
         # If the user did NOT specify specify Matplotlib `figure` and `axis`
         # objects for this function to use.
         fig, axes = create_graph(figure_size=(30, 23), nrow=4, ncol=2)
+        # Trim the outer margins of the figure here so that saving it does
+        # not require the extra draw that `bbox_inches="tight"` performs.
+        # Room is left at the top for the figure-level legend.
+        fig.subplots_adjust(left=0.04, right=0.985, bottom=0.035, top=0.945)
     else:
         fig, axes = plot_objs
 
-    # Next, begin creating the subplots with the feature data.
-    add_scatter_to_ax_obj(
-        ax_obj=axes[0, 0],
-        x_data=feature_data[:, 0],
-        y_data=feature_data[:, 1],
-        color_arr=predicted_labels,
-        x_lab="Time in Match",
-        y_lab="Score Differential",
-        title_lab="Score Differential v. Time in Match"
-    )   # score diff. v. time
-    add_scatter_to_ax_obj(
-        ax_obj=axes[0, 1],
-        x_data=feature_data[:, 0],
-        y_data=feature_data[:, 6],
-        color_arr=predicted_labels,
-        x_lab="Time in Match",
-        y_lab=r"$\Delta$ Position Dist.",
-        title_lab=r"$\Delta$ Position Dist. v. Time in Match"
-    )   # pos. delta v. time
-
-    add_scatter_to_ax_obj(
-        ax_obj=axes[1, 0],
-        x_data=feature_data[:, 0],
-        y_data=feature_data[:, 7],
-        color_arr=predicted_labels,
-        x_lab="Time in Match",
-        y_lab=r"$\Delta$ To Goal Dist.",
-        title_lab=r"$\Delta$ To Goal Dist. v. Time in Match"
-    )   # to goal delta v. time
-    add_scatter_to_ax_obj(
-        ax_obj=axes[1, 1],
-        x_data=feature_data[:, 1],
-        y_data=feature_data[:, 6],
-        color_arr=predicted_labels,
-        x_lab="Score Differential",
-        y_lab=r"$\Delta$ Position Dist.",
-        title_lab=r"$\Delta$ Position Dist. v. Score Differential"
-    )   # pos. delta v. score diff.
-
-    add_scatter_to_ax_obj(
-        ax_obj=axes[2, 0],
-        x_data=feature_data[:, 1],
-        y_data=feature_data[:, 7],
-        color_arr=predicted_labels,
-        x_lab="Score Differential",
-        y_lab=r"$\Delta$ To Goal Dist.",
-        title_lab=r"$\Delta$ To Goal Dist. v. Score Differential"
-    )  # to goal delta v. score diff.
-    add_scatter_to_ax_obj(
-        ax_obj=axes[2, 1],
-        x_data=feature_data[:, 7],
-        y_data=feature_data[:, 6],
-        color_arr=predicted_labels,
-        x_lab=r"$\Delta$ To Goal Dist.",
-        y_lab=r"$\Delta$ Position Dist.",
-        title_lab=r"$\Delta$ Position Dist. v. $\Delta$ To Goal Dist."
-    )  # pos. delta v. to goal delta
+    # The same class labels color every subplot, so map them to colors (and
+    # legend entries) once up front.
+    point_colors, class_legend_elements = _cluster_colors(predicted_labels)
+
+    # The subplots cannot visually resolve more than a few tens of thousands
+    # of points, so if there are more data instances than that, only display
+    # (and run TSNE on) a random subset of them. Since TSNE does not depend
+    # on the order of its inputs, the sampled indicies are left unshuffled
+    # which only requires work proportional to the size of the sample.
+    if feature_data.shape[0] > MAX_SCATTER_POINTS:
+        rng = np.random.default_rng(1169)
+        sample_indicies = rng.choice(
+            feature_data.shape[0], size=MAX_SCATTER_POINTS, replace=False,
+            shuffle=False
+        )
+        feature_data = feature_data[sample_indicies]
+        point_colors = point_colors[sample_indicies]
 
-    add_scatter_to_ax_obj(
-        ax_obj=axes[3, 0],
-        x_data=feature_data[:, 8],
-        y_data=feature_data[:, 9],
-        color_arr=predicted_labels,
-        x_lab=r"No. Attacking Events",
-        y_lab=r"Max-Avg. $\Delta$ Dists.",
-        title_lab=r"Max-Avg. $\Delta$ Dists. v. No. Attacking Events"
-    )  # max-avg. delta positions v. num of attacking events
-
-    # Now we want to create the TSNE graph.
-    tsne_transformer = TSNE(n_components=2, random_state=1169, n_jobs=-1)
-    if feature_data.shape[0] > 75000:
-        wout_replace_indicies = np.random.choice(
-            a=np.arange(0, feature_data.shape[0]), size=75000, replace=False
+    # Next, begin creating the subplots with the feature data.
+    for (row, col), x_col, y_col, x_lab, y_lab in CLUSTER_SCATTER_PANELS:
+        add_scatter_to_ax_obj(
+            ax_obj=axes[row, col],
+            x_data=feature_data[:, x_col],
+            y_data=feature_data[:, y_col],
+            color_arr=point_colors,
+            draw_legend=False,
+            _internal=True,
+            x_lab=x_lab,
+            y_lab=y_lab,
+            title_lab=f"{y_lab} v. {x_lab}"
         )
-        feat_data_to_transform = feature_data[wout_replace_indicies]
-        wout_predicted_labs = predicted_labels[wout_replace_indicies]
+
+    # Now we want to create the TSNE graph. Note that for very small data
+    # sets TSNE is not worth running and so the first two raw features are
+    # displayed instead.
+    if feature_data.shape[0] >= MIN_TSNE_POINTS:
+        features_embedded = _tsne_cached(feature_data)
+        tsne_x_lab, tsne_y_lab = "TSNE Feature 1", "TSNE Feature 2"
+        tsne_title_lab = "TSNE Plot w/2 Components"
     else:
-        feat_data_to_transform = feature_data
-        wout_predicted_labs = predicted_labels
-    features_embedded = tsne_transformer.fit_transform(feat_data_to_transform)
+        features_embedded = feature_data[:, :2]
+        tsne_x_lab, tsne_y_lab = "Time in Match", "Score Differential"
+        tsne_title_lab = "Raw Features (Too Few Points for TSNE)"
 
     assert features_embedded.shape[1] == 2
-    assert features_embedded.shape[0] == feat_data_to_transform.shape[0]
+    assert features_embedded.shape[0] == feature_data.shape[0]
     add_scatter_to_ax_obj(
         ax_obj=axes[3, 1],
         x_data=features_embedded[:, 0],
         y_data=features_embedded[:, 1],
-        color_arr=wout_predicted_labs,
-        x_lab="TSNE Feature 1",
-        y_lab="TSNE Feature 2",
-        title_lab="TSNE Plot w/2 Components")
-
-    # Finally, display the final result and save the result if specified
-    # by the user.
-    fig.show()
-    if save_plot:
-        plot_dir = os.path.join(
-            SCRIPT_DIR, "../../visualizations/")
-
-        file_name = kwargs.get("file_name", None)
-        try:
-            assert not isinstance(file_name, type(None))
-        except BaseException:
-            err_msg = "The user has specified that they would like the\
-            subplot generated by this function to be saved. When this is\
-            done, the user must pass in the name of the file that the subplot\
-            image will be written to. This is has not been done in this\
-            function call. Please do so."
+        color_arr=point_colors,
+        draw_legend=False,
+        _internal=True,
+        x_lab=tsne_x_lab,
+        y_lab=tsne_y_lab,
+        title_lab=tsne_title_lab)
+
+    # Every subplot is colored by the same classes, so a single legend is
+    # drawn for the entire figure rather than one per subplot.
+    fig.legend(*class_legend_elements,
+               loc="upper center",
+               title="Predicted Class",
+               title_fontsize=15,
+               fontsize="x-large",
+               frameon=False,
+               ncol=len(class_legend_elements[0]))
+
+    # Finally, display the final result or save it if specified by the
+    # user.
+    if not save_plot:
+        # If the figure is only being displayed rather than written to disk.
+        fig.show()
+    else:
+        file_name = kwargs.get("file_name")
+        if file_name is None:
+            # If the user did NOT specify the name of the file to write to.
+            err_msg = ("The user has specified that they would like the "
+                       "subplot generated by this function to be saved. When "
+                       "this is done, the user must pass in the name of the "
+                       "file that the subplot image will be written to. This "
+                       "is has not been done in this function call. Please "
+                       "do so.")
 
             print(err_msg)
-            raise ValueError
+            raise ValueError(err_msg)
 
-        if "." not in file_name:
-            file_name += ".png"
+        save_path = PLOT_DIR / file_name
+        if not save_path.suffix:
+            # If the user did NOT specify the format of the file.
+            save_path = save_path.with_suffix(".png")
 
-        fig.savefig("{}/{}".format(plot_dir, file_name), bbox_inches="tight")
+        save_kwargs = {"dpi": 100}
+        if save_path.suffix.lower() == ".png":
+            # If the figure is written to a PNG, use a fast (but still
+            # lossless) compression level. Note that the other formats do
+            # not accept this option.
+            save_kwargs["pil_kwargs"] = {"compress_level": 1}
+        if not isinstance(plot_objs, type(None)):
+            # If the user passed in their own figure, its margins were not
+            # trimmed above, so trim them when saving.
+            save_kwargs["bbox_inches"] = "tight"
 
-    return to_return
+        fig.savefig(save_path, **save_kwargs)
 
 
 def plotly_bar_chart(
         cluster_count_df: pd.DataFrame, 
         args_dict: dict, 
         cluster_id: int, 
-        total_count_df=None) -> RANDOM_PLOTLY_BAR_OBJ:
+        total_count_df=None) -> PLOTLY_FIG_TYPE:
     """
     Purpose
     -------
@@ -522,7 +729,15 @@ def plotly_bar_chart(
         of interest that this bar chart corresponds to. All this is used
         for is to create the title of the bar chart.
     total_count_df : Python None object or Pandas DataFrame
-        This argument allows the user to specify 
+        This argument allows the user to specify the counts for all of the
+        clusters combined so that the bar chart displays the normalized
+        counts of the cluster of interest relative to them. When a
+        DataFrame is given, its `"x"` column must list the same labels in
+        the same order as that of `cluster_count_df` (which is the case for
+        two outputs of `cluster_bar_chart_prep.cluster_counts`).
+
+        This parameter defaults to `None` in which case the normalized
+        counts themselves are displayed.
 
     Returns
     -------
@@ -536,14 +751,15 @@ def plotly_bar_chart(
         This error is raised when the user, for at least one parameter,
         passes in an object whose type is not among the accepted types
         for that parameter.
+    AssertionError
+        This error is raised when `cluster_count_df` and `total_count_df`
+        do not list the same labels in the same order.
 
     References
     ----------
     1. https://plotly.com/python/bar-charts/
-    2. https://plotly.com/python-api-reference/generated/plotly.express.bar
+    2. https://plotly.com/python-api-reference/generated/plotly.graph_objects.Bar.html
     """
-    to_return = None
-
     # First, validate the input data.
     ipv.parameter_type_validator(expected_type=pd.DataFrame,
                                  parameter_var=cluster_count_df)
@@ -553,14 +769,12 @@ def plotly_bar_chart(
                                  parameter_var=total_count_df)
 
     # Next, define necessary values that will be used later on.
-    x_arg, y_arg = args_dict.get("x"), args_dict.get("y")
-    text_arg = args_dict.get("text")
+    x_arg, y_arg, text_arg = itemgetter("x", "y", "text")(args_dict)
 
     is_for_subevents = "sub" in x_arg
     is_rel_to_avg = isinstance(total_count_df, pd.DataFrame)
 
     opacity_lvl = 0.65
-    bar_color = "rgb(195, 62, 227)"
     plot_width = 1200
     plot_height = 700
     x_label_tilt = 45
@@ -569,43 +783,39 @@ def plotly_bar_chart(
               else "Event Type Name"
     y_label = "Normalized Count Relative to All Clusters" if is_rel_to_avg \
               else "Normalized Count"
-    axes_label_dict = {x_arg: x_label,
-                       y_arg: y_label}
-    plot_title = \
-        "Sub-Event Types Bar Chart for Cluster {}".format(cluster_id) if is_for_subevents\
-        else "Event Types Bar Chart for Cluster {}".format(cluster_id)
+    plot_title = (f"{'Sub-Event' if is_for_subevents else 'Event'} Types "
+                  f"Bar Chart for Cluster {cluster_id}")
 
     if is_rel_to_avg:
-        # 
-        rel_ncount_series = cluster_count_df[y_arg] - total_count_df[y_arg]
-
-        df_to_plot = cluster_count_df[[x_arg, text_arg]]
-        df_to_plot[y_arg] = rel_ncount_series
+        # If the user would like the normalized counts to be displayed
+        # relative to those of all of the clusters. Note that the two sets
+        # of counts are subtracted position-by-position, so they must list
+        # their labels in the same order.
+        x_arr = cluster_count_df[x_arg].to_numpy()
+        assert np.array_equal(x_arr, total_count_df[x_arg].to_numpy())
+
+        df_to_plot = pd.DataFrame(
+            {x_arg: x_arr,
+             y_arg: np.subtract(cluster_count_df[y_arg].to_numpy(),
+                                total_count_df[y_arg].to_numpy()),
+             text_arg: cluster_count_df[text_arg].to_numpy()},
+            copy=False
+        )
     else:
         df_to_plot = cluster_count_df
 
     # Now we can create the bar chart itself.
-    bar_obj = px.bar(data_frame=df_to_plot,
-                     x=x_arg,
-                     y=y_arg,
-                     text=text_arg,
-                     labels=axes_label_dict,
-                     opacity=opacity_lvl,
-                     width=plot_width,
-                     height=plot_height)
-    bar_obj.update_traces(marker_color=bar_color,
-                          marker_line_color='rgb(0, 0, 0)',
-                          marker_line_width=.75)
-    bar_obj.update_layout(font={"family": "Times New Roman",
-                                "size": 18,
-                                "color": "black"},
-                          title={"text": plot_title,
-                                 "y": 0.965,
-                                 "x": 0.5,
-                                 "xanchor": "center",
-                                 "yanchor": "top"},
+    bar_obj = go.Figure(go.Bar(x=df_to_plot[x_arg].to_numpy(),
+                               y=df_to_plot[y_arg].to_numpy(),
+                               text=df_to_plot[text_arg].to_numpy(),
+                               opacity=opacity_lvl,
+                               **PLOTLY_MARKER))
+    bar_obj.update_layout(width=plot_width,
+                          height=plot_height,
+                          xaxis_title=x_label,
+                          yaxis_title=y_label,
+                          font=PLOTLY_FONT,
+                          title={**PLOTLY_TITLE_BASE, "text": plot_title},
                           xaxis_tickangle=x_label_tilt)
 
-    to_return = bar_obj
-
-    return to_return
+    return bar_obj
@@ -24,12 +24,54 @@ import numpy as np
 # custom modules
 from src.data.data_loader import sequence_data, event_id_mapper
 from src.test import input_parameter_validation as ipv
+from src.visualizations import contour_position_prep as cpp
 
 # define variables that will be used throughout script
 SCRIPT_DIR = os.path.dirname(__file__)
-SEQUENCES_DF = sequence_data()
 EVENT_ID_TO_NAME_DF = event_id_mapper()
 
+# every possible event and sub-event name (in alphabetical order). These are
+# used as the categories of the event name columns so that the counts of
+# these names always cover all of them.
+ALL_EVENT_LABELS = np.sort(EVENT_ID_TO_NAME_DF.event_label.unique())
+ALL_SUB_EVENT_LABELS = np.sort(EVENT_ID_TO_NAME_DF.subevent_label.unique())
+EVENT_NAME_DTYPE = pd.CategoricalDtype(ALL_EVENT_LABELS)
+SUB_EVENT_NAME_DTYPE = pd.CategoricalDtype(ALL_SUB_EVENT_LABELS)
+
+# ID columns of the sequence data that are stored in the smallest integer
+# type that can hold all of their values.
+SEQUENCE_ID_COLS = ["seq_id", "id", "eventId", "subEventId",
+                    "matchId", "teamId", "playerId"]
+
+
+def _load_sequences() -> pd.DataFrame:
+    """
+    Loads the sequence data with its event name columns cast to the above
+    categorical types, its ID columns downcast, and the positions of its
+    events already parsed (see `contour_position_prep.raw_positions_loader`).
+    The result is indexed by (and sorted on) `seq_id` since every cluster's
+    events are looked up by their sequence IDs. Note that the sort is
+    stable so the events of each sequence stay in order.
+    """
+    sequences_df = sequence_data()
+    sequences_df = pd.concat(
+        [sequences_df, cpp.raw_positions_loader(sequences_df.positions)],
+        axis="columns"
+    )
+    for col in SEQUENCE_ID_COLS:
+        # Note that `pd.to_numeric` only downcasts to a type that can hold
+        # every value of the column.
+        sequences_df[col] = pd.to_numeric(sequences_df[col],
+                                          downcast="integer")
+
+    return sequences_df.astype(
+        {"eventName": EVENT_NAME_DTYPE, "subEventName": SUB_EVENT_NAME_DTYPE}
+    ).set_index("seq_id").sort_index(kind="mergesort")
+
+
+SEQUENCES_DF = _load_sequences()
+SEQUENCES_COLS = frozenset(SEQUENCES_DF.columns)
+
 
 ################################
 ### Define Modular Functions ###
@@ -90,41 +132,100 @@ def cluster_events_extractor(
                                  parameter_var=feat_pred_df)
     ipv.parameter_type_validator(expected_type=int, parameter_var=cluster_id)
 
-    are_keywords = len(kwargs.keys()) > 0 
+    are_keywords = len(kwargs.keys()) > 0
     if are_keywords:
         # If the user passed in keyword arguments to this function.
-        try:
-            for val in kwargs.values():
-                ipv.parameter_type_validator(str, val)
-                assert val in SEQUENCES_DF.columns
-        except (ValueError, AssertionError):
-            err_msg = "This function only accepts Python string-objects\
-            that are equivalent to one of the column labels in the original\
-            sequence data. One or more of this values passed in by the\
-            user did not meet this criteria."
+        kwarg_vals = tuple(kwargs.values())
+        if not (all(isinstance(val, str) for val in kwarg_vals)
+                and SEQUENCES_COLS.issuperset(kwarg_vals)):
+            err_msg = ("This function only accepts Python string-objects "
+                       "that are equivalent to one of the column labels in "
+                       "the original sequence data. One or more of this "
+                       "values passed in by the user did not meet this "
+                       "criteria.")
             raise KeyError(err_msg)
 
     # Next, compile all of the events that fall in to the cluster that is
     # specified by the `cluster_id` parameter.
-    cluster_seq_ids = list(
-        feat_pred_df[feat_pred_df.predicted_cluster_id == cluster_id].index
-    )
+    cluster_seq_ids = feat_pred_df.index.to_numpy()[
+        feat_pred_df.predicted_cluster_id.to_numpy() == cluster_id
+    ]
 
     columns_to_keep = list(kwargs.values()) if are_keywords \
                       else ["eventId", "eventName", "subEventId", "subEventName"]
-    cluster_events_df = SEQUENCES_DF.set_index("seq_id").loc[
-        cluster_seq_ids][columns_to_keep]
+    cluster_events_df = SEQUENCES_DF.loc[cluster_seq_ids, columns_to_keep]
 
-    # Finally, validate and return the result.
-    feat_pred_cluster_counts = feat_pred_df.predicted_cluster_id.value_counts()
-    assert feat_pred_cluster_counts[cluster_id] == cluster_events_df.index.unique(
-    ).size
+    # Finally, validate and return the result. Note that every sequence in
+    # the cluster should have had at least one event.
+    assert cluster_seq_ids.size == cluster_events_df.index.nunique()
 
     to_return = cluster_events_df
 
     return to_return
 
 
+def _label_counts(
+        labels_series: pd.Series, labels_dtype: pd.CategoricalDtype,
+        col_names: tuple) -> pd.DataFrame:
+    """
+    Purpose
+    -------
+    The purpose of this function is to count how many times each of the
+    possible labels in `labels_dtype` occurs in `labels_series` and put
+    those counts (both raw and normalized) in a DataFrame for
+    `cluster_counts`.
+
+    Note that since the labels are categorical (which is a no-op to cast
+    to if `labels_series` came from `cluster_events_extractor`), the
+    counts cover every possible label (including those that do not occur
+    in this cluster) and are in alphabetical order.
+
+    Parameters
+    ----------
+    labels_series : Pandas Series
+        This parameter allows the user to specify the labels to count.
+    labels_dtype : Pandas CategoricalDtype
+        This parameter allows the user to specify every possible label.
+    col_names : tuple of three str
+        This parameter allows the user to specify the names of the label,
+        count, and normalized count columns of the result respectively.
+
+    Returns
+    -------
+    to_return : Pandas DataFrame
+        This function returns a DataFrame with one row per possible label
+        and the three columns named in `col_names`.
+
+    Raises
+    ------
+    AssertionError
+        This error is raised when `labels_series` has no (non-missing)
+        labels to count since the counts then cannot be normalized.
+    """
+    label_col, count_col, ncount_col = col_names
+
+    # Count the labels by their category codes. Note that missing labels
+    # have a code of -1 and are not counted (just as with `value_counts`).
+    label_codes = labels_series.astype(labels_dtype).cat.codes.to_numpy()
+    counts_arr = np.bincount(label_codes[label_codes >= 0],
+                             minlength=labels_dtype.categories.size)
+
+    # Since the normalized counts are the counts divided by their total,
+    # they sum to 1 as long as there is at least one label to count.
+    total_count = counts_arr.sum()
+    assert total_count > 0
+
+    # Note that all three columns are given at once so that the DataFrame
+    # does not have to be rebuilt when a column is added to it.
+    to_return = pd.DataFrame(
+        {label_col: labels_dtype.categories.to_numpy(),
+         count_col: counts_arr,
+         ncount_col: counts_arr / total_count}
+    )
+
+    return to_return
+
+
 def cluster_counts(
         cluster_events_df: pd.DataFrame) -> tuple:
     """
@@ -134,8 +235,8 @@ def cluster_counts(
     to a particular cluster and create two new dataframes that contain all
     of the type and subtype event possibilities and their corresponding
     counts in the cluster event data respectively. The function is set up
-    in this way because the output is perfectly suited for use with Plotly
-    Express bar chart function (see `basic_viz` script that is found in
+    in this way because the output is perfectly suited for use with the
+    `plotly_bar_chart` function (see `basic_viz` script that is found in
     this directory).
 
     Parameters
@@ -158,94 +259,98 @@ def cluster_counts(
         This error is raised when the user, for at least one parameter,
         passes in an object whose type is not among the accepted types
         for that parameter.
+    AssertionError
+        This error is raised when `cluster_events_df` has no events (or
+        no sub events) to count.
 
     References
     ----------
-    1. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.sort_values.html
+    1. https://pandas.pydata.org/pandas-docs/stable/user_guide/categorical.html
+    2. https://numpy.org/doc/stable/reference/generated/numpy.bincount.html
     """
     to_return = None
     # First, validate the input data.
     ipv.parameter_type_validator(expected_type=pd.DataFrame,
                                  parameter_var=cluster_events_df)
 
-    # Next, define some variables that will be helpful later on
-    all_possible_events_arr = EVENT_ID_TO_NAME_DF.event_label.unique()
-    all_possible_subevents_arr = EVENT_ID_TO_NAME_DF.subevent_label.unique()
-
-    # Now, get the counts of events
-    events_counts_series = cluster_events_df.eventName.value_counts()
-    n0events_counts_df = events_counts_series.reset_index().rename(
-        columns={"eventName": "event_count", "index": "event_name"}
+    # Now, get the counts of events and sub events.
+    nevents_counts_df = _label_counts(
+        cluster_events_df.eventName, EVENT_NAME_DTYPE,
+        col_names=("event_name", "event_count", "nevent_count")
     )
-    if n0events_counts_df.shape[0] != all_possible_events_arr.size:
-        # If we do NOT have a count value for each possible event ID.
-        events_that_have_count = \
-            n0events_counts_df.event_name.to_numpy().tolist()
-        events_missing_list = [
-            event_label for event_label in all_possible_events_arr.tolist()
-            if event_label not in events_that_have_count
-        ]
-        assert len(events_missing_list) + len(events_that_have_count) == \
-            all_possible_events_arr.size
-
-        missing_events_counts_df = pd.DataFrame(
-            {"event_count": [0] * len(events_missing_list),
-             "event_name": events_missing_list}
-        )
-
-        nevents_counts_df = pd.concat(
-            [n0events_counts_df, missing_events_counts_df]
-        ).reset_index(drop=True)
-        assert nevents_counts_df.shape[0] == all_possible_events_arr.size
-    else:
-        nevents_counts_df = n0events_counts_df
-
-    nevents_counts_df["nevent_count"] = \
-        nevents_counts_df.event_count / nevents_counts_df.event_count.sum()
-    nevents_counts_df.sort_values(
-        by="event_name", axis="index", inplace=True, ignore_index=True
+    nsub_events_counts_df = _label_counts(
+        cluster_events_df.subEventName, SUB_EVENT_NAME_DTYPE,
+        col_names=("sub_event_name", "sub_event_count", "nsub_event_count")
     )
 
-    # Now, get the counts of sub events if the user would like the function
-    # to.
-    sub_events_counts_series = cluster_events_df.subEventName.value_counts()
-    n0sub_events_counts_df = sub_events_counts_series.reset_index().rename(
-        columns={"subEventName": "sub_event_count", "index": "sub_event_name"}
-    )
-    if n0sub_events_counts_df.shape[0] != all_possible_subevents_arr.size:
-        # If we do NOT have a count value for each possible subevent
-        # ID.
-        sub_events_that_have_count = \
-            n0sub_events_counts_df.sub_event_name.to_numpy().tolist()
-        sub_events_missing_list = [
-            sub_event_label for sub_event_label in all_possible_subevents_arr.tolist()
-            if sub_event_label not in sub_events_that_have_count
-        ]
-        assert len(sub_events_missing_list) + len(sub_events_that_have_count) == \
-            all_possible_subevents_arr.size
-
-        missing_subevents_counts_df = pd.DataFrame(
-            {"sub_event_count": [0] * len(sub_events_missing_list),
-             "sub_event_name": sub_events_missing_list}
-        )
-
-        nsub_events_counts_df = pd.concat(
-            [n0sub_events_counts_df, missing_subevents_counts_df]
-        ).reset_index(drop=True)
-        assert nsub_events_counts_df.shape[0] == all_possible_subevents_arr.size
-    else:
-        nsub_events_counts_df = n0sub_events_counts_df
-
-    nsub_events_counts_df["nsub_event_count"] = \
-        nsub_events_counts_df.sub_event_count / nsub_events_counts_df.sub_event_count.sum()
-    nsub_events_counts_df.sort_values(
-        by="sub_event_name", axis="index", inplace=True, ignore_index=True
+    # Finally, return the result. Note that `_label_counts` has already
+    # checked that both sets of normalized counts sum to 1.
+    to_return = (nevents_counts_df, nsub_events_counts_df)
+
+    return to_return
+
+
+def prepare_cluster(feat_pred_df: pd.DataFrame, cluster_id: int) -> tuple:
+    """
+    Purpose
+    -------
+    The purpose of this function is to compute everything that is
+    displayed for a particular cluster (i.e., its event counts, sub-event
+    counts, and event positions) from a single look-up of that cluster's
+    events in the sequence data. This is equivalent to (but faster than)
+    calling `cluster_events_extractor` once for `cluster_counts` and again
+    for `contour_position_prep.cluster_positions_extractor`.
+
+    Parameters
+    ----------
+    feat_pred_df : pd.DataFrame
+        Short for feature-prediction dataframe, this argument allows the
+        user to specify the entire collection of events and set piece
+        sequences that we have data for.
+    cluster_id : int
+        This argument allows the user to specify the ID of the cluster
+        of interest.
+
+    Returns
+    -------
+    to_return : tuple
+        This function returns a tuple that contains three Pandas
+        DataFrames. These, in the order that they are given, are:
+            1. The count values for all of the possible event types (see
+               `cluster_counts`).
+            2. The count values for all of the possible sub-event types
+               (see `cluster_counts`).
+            3. The starting and ending field point of each event in the
+               cluster (see
+               `contour_position_prep.cluster_positions_extractor`).
+
+    Raises
+    ------
+    ValueError
+        This error is raised when the user, for at least one parameter,
+        passes in an object whose type is not among the accepted types
+        for that parameter.
+    AssertionError
+        This error is raised when the cluster has no events to count.
+    """
+    # First, get all of the columns that any of the results need for the
+    # events of this cluster at once. Note that the parameters are
+    # validated by `cluster_events_extractor`.
+    position_cols = ["id", "matchId", "teamId"] + cpp.RAW_POSITION_COLS
+    cluster_events_df = cluster_events_extractor(
+        feat_pred_df,
+        cluster_id,
+        **{"col{}".format(i): col for i, col in
+           enumerate(["eventName", "subEventName"] + position_cols)}
     )
 
-    # Finally, validate and return the result.
-    assert np.isclose(nevents_counts_df.nevent_count.sum(), 1)
-    assert np.isclose(nsub_events_counts_df.nsub_event_count.sum(), 1)
+    # Next, compute each of the results from those events.
+    nevents_counts_df, nsub_events_counts_df = cluster_counts(
+        cluster_events_df)
+    positions_df = cpp.cluster_positions_extractor(
+        cluster_events_df[position_cols])
 
-    to_return = (nevents_counts_df, nsub_events_counts_df)
+    # Finally, return the results.
+    to_return = (nevents_counts_df, nsub_events_counts_df, positions_df)
 
     return to_return
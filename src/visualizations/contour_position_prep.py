@@ -17,18 +17,31 @@ the clusters from each other.
 ###################################
 # file access
 import os
+from hashlib import blake2b
 
 # data manipulation
 from ast import literal_eval
+import json
 import pandas as pd
 import numpy as np
-import swifter
+try:
+    from numba import njit, prange
+except ImportError:
+    # If Numba is not installed, the Numpy version of `_scale_positions`
+    # (see below) is used instead.
+    njit = None
 
 # custom modules
 from src.test import input_parameter_validation as ipv
 
 # define variables that will be used throughout script
 SCRIPT_DIR = os.path.dirname(__file__)
+POSITIONS_CACHE_DIR = os.path.join(SCRIPT_DIR, "../../cache/positions")
+
+# columns that hold the raw starting and ending points of each event once the
+# `positions` column has been parsed (see `raw_positions_loader`).
+RAW_POSITION_COLS = ["starting_x_raw", "starting_y_raw",
+                     "ending_x_raw", "ending_y_raw"]
 
 
 ################################
@@ -156,6 +169,270 @@ def event_ending_point_extractor(row) -> int:
     return to_return
 
 
+def _scan_raw_positions(positions_list: list):
+    """
+    Purpose
+    -------
+    The purpose of this function is to parse the entries of the
+    `positions` column without building any Python objects for them. All
+    of the entries are joined into one byte array and the integers in it
+    are read off with Numpy. This is only possible when every entry has
+    the layout that the sequence data uses (i.e., `"[{'y': 61, 'x': 37},
+    {'y': 50, 'x': 35}]"`); see `raw_positions_parser`.
+
+    Parameters
+    ----------
+    positions_list : list of str
+        This parameter allows the user to specify the entries of the
+        `positions` column.
+
+    Returns
+    -------
+    to_return : Numpy Array or None
+        This function returns the same array as `raw_positions_parser` or
+        `None` if any entry does not have the expected layout.
+
+    Raises
+    ------
+    AssertionError
+        This error is raised when an entry does not list either one or two
+        points.
+    """
+    positions_bytes = np.frombuffer("".join(positions_list).encode(),
+                                    dtype=np.uint8)
+
+    # First, locate where each point (i.e., dictionary) starts and where
+    # each entry (i.e., list) ends.
+    point_starts = np.flatnonzero(positions_bytes == ord("{"))
+    entry_ends = np.flatnonzero(positions_bytes == ord("]"))
+    if entry_ends.size != len(positions_list) or point_starts.size == 0 \
+            or point_starts[-1] + 2 >= positions_bytes.size:
+        # If the entries are not the expected lists of dictionaries.
+        return None
+
+    # Next, determine the order of the keys of each point which has to be
+    # the same for every point.
+    first_keys = positions_bytes[point_starts + 2]
+    if (first_keys == ord("y")).all():
+        xy_order = [1, 0]
+    elif (first_keys == ord("x")).all():
+        xy_order = [0, 1]
+    else:
+        return None
+
+    # Now, read off every (whole) number. Each run of digits is one number
+    # whose digits are weighted by their place value and summed.
+    is_digit = (positions_bytes >= ord("0")) & (positions_bytes <= ord("9"))
+    digit_run_edges = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    num_starts = np.flatnonzero(digit_run_edges == 1)
+    num_ends = np.flatnonzero(digit_run_edges == -1)
+    if num_starts.size != 2*point_starts.size:
+        # If a point does not consist of exactly two whole numbers.
+        return None
+
+    num_lengths = num_ends - num_starts
+    digit_indicies = np.flatnonzero(is_digit)
+    place_values = 10.0**(num_ends.repeat(num_lengths) - 1 - digit_indicies)
+    nums = np.add.reduceat(
+        (positions_bytes[digit_indicies] - ord("0"))*place_values,
+        np.cumsum(num_lengths) - num_lengths
+    )
+    nums[positions_bytes[num_starts - 1] == ord("-")] *= -1
+    points = nums.reshape(-1, 2)[:, xy_order]
+
+    # Finally, collect the first and last point of each entry. Note that if
+    # there is only one point, the last point is also the first one.
+    num_points = np.diff(np.searchsorted(point_starts, entry_ends), prepend=0)
+    assert ((1 <= num_points) & (num_points <= 2)).all()
+
+    last_points = np.cumsum(num_points) - 1
+    first_points = last_points - num_points + 1
+    to_return = np.hstack([points[first_points], points[last_points]])
+
+    return to_return
+
+
+def raw_positions_parser(positions_series: pd.Series) -> np.ndarray:
+    """
+    Purpose
+    -------
+    The purpose of this function is to take the `positions` column of the
+    sequence data (where each entry is the string representation of a
+    list of one or two points) and parse all of its entries at once into
+    a single Numpy Array of the raw (i.e., unscaled) field positions.
+
+    This replaces calling `event_starting_point_extractor` and
+    `event_ending_point_extractor` on every row. When every entry has the
+    layout used by the sequence data, the integers are read directly off
+    of the entries' bytes (see `_scan_raw_positions`). Otherwise, the
+    entire column is converted into one JSON document that is parsed with
+    a single call to `json.loads`.
+
+    Parameters
+    ----------
+    positions_series : Pandas Series
+        This parameter allows the user to specify the `positions` column
+        of the events whose positions they would like to parse.
+
+    Returns
+    -------
+    to_return : Numpy Array
+        This function returns a Numpy Array of shape `(N, 4)` whose columns
+        are the raw starting x, starting y, ending x, and ending y values
+        of each event. Note that for events that do not have an ending
+        point (i.e., a foul), the ending point is the starting point.
+
+    Raises
+    ------
+    AssertionError
+        This error is raised when an entry of `positions_series` does not
+        list either one or two points.
+
+    References
+    ----------
+    1. https://docs.python.org/3/library/json.html#json.loads
+    2. https://numpy.org/doc/stable/reference/generated/numpy.ufunc.reduceat.html
+    """
+    # First, try to read the positions directly.
+    positions_list = positions_series.tolist()
+    to_return = _scan_raw_positions(positions_list)
+    if to_return is not None:
+        return to_return
+
+    # If they could not be, parse all of the entries. Note that the entries
+    # were written as Python lists of dictionaries and thus use single
+    # quotes.
+    parsed_list = json.loads(
+        "[{}]".format(",".join(positions_list).replace("'", '"'))
+    )
+    assert all(1 <= len(points) <= 2 for points in parsed_list)
+
+    # Next, collect the starting and ending points. Note that if there is
+    # only one point, the last point is also the first one.
+    to_return = np.array(
+        [[points[0]["x"], points[0]["y"], points[-1]["x"], points[-1]["y"]]
+         for points in parsed_list],
+        dtype=np.float64
+    ).reshape(-1, 4)
+
+    return to_return
+
+
+def raw_positions_loader(positions_series: pd.Series) -> pd.DataFrame:
+    """
+    Purpose
+    -------
+    The purpose of this function is to parse the `positions` column of the
+    entire sequence data set once so that the positions of a cluster's
+    events do not have to be parsed every time that cluster is plotted.
+
+    The parsed positions are written to a Parquet file in the
+    `POSITIONS_CACHE_DIR` directory whose name is a hash of the contents of
+    `positions_series`. Thus, later calls (including those in other Python
+    sessions) with the same data read that file instead of parsing the
+    positions again, while calls with different data do not.
+
+    Parameters
+    ----------
+    positions_series : Pandas Series
+        This parameter allows the user to specify the `positions` column
+        of the sequence data.
+
+    Returns
+    -------
+    to_return : Pandas DataFrame
+        This function returns a DataFrame with the same index as
+        `positions_series` whose columns are those in `RAW_POSITION_COLS`
+        (see `raw_positions_parser` for what they contain).
+
+    References
+    ----------
+    1. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.util.hash_pandas_object.html
+    2. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.to_parquet.html
+    """
+    # First, determine the file that the parsed positions are written to.
+    positions_hash = blake2b(
+        pd.util.hash_pandas_object(positions_series, index=False).to_numpy(),
+        digest_size=16
+    ).hexdigest()
+    cache_path = os.path.join(POSITIONS_CACHE_DIR,
+                              "{}.parquet".format(positions_hash))
+
+    # Next, either read in or parse the positions.
+    if os.path.exists(cache_path):
+        # If these positions have already been parsed.
+        raw_positions_df = pd.read_parquet(cache_path)
+    else:
+        raw_positions_df = pd.DataFrame(
+            raw_positions_parser(positions_series).astype(np.float32),
+            columns=RAW_POSITION_COLS
+        )
+        try:
+            os.makedirs(POSITIONS_CACHE_DIR, exist_ok=True)
+            raw_positions_df.to_parquet(cache_path)
+        except ImportError:
+            # If there is no Parquet engine (i.e., `pyarrow`) installed. In
+            # this case the positions will simply be parsed again next time.
+            pass
+
+    # Finally, return the result.
+    raw_positions_df.index = positions_series.index
+    to_return = raw_positions_df
+
+    return to_return
+
+
+def _scale_positions_numpy(
+        raw_positions_arr: np.ndarray, out_arr: np.ndarray) -> np.ndarray:
+    """
+    Purpose
+    -------
+    The purpose of this function is to take the raw positions returned by
+    `raw_positions_parser` and write them to `out_arr` in the same units
+    used by `event_starting_point_extractor` and
+    `event_ending_point_extractor`. This version is used when Numba is not
+    installed; see `_scale_positions`.
+
+    Parameters
+    ----------
+    raw_positions_arr : Numpy Array
+        This parameter allows the user to specify the `(N, 4)` array of
+        raw starting x, starting y, ending x, and ending y values.
+    out_arr : Numpy Array
+        This parameter allows the user to specify the `(N, 4)` float array
+        that the scaled positions will be written to.
+
+    Returns
+    -------
+    to_return : Numpy Array
+        This function returns `out_arr` after it has been filled in.
+    """
+    out_arr[:, 0] = (raw_positions_arr[:, 0]/100)*104
+    out_arr[:, 1] = (raw_positions_arr[:, 1]/100)*68
+    out_arr[:, 2] = raw_positions_arr[:, 2]
+    out_arr[:, 3] = (raw_positions_arr[:, 3]/100)*69
+
+    return out_arr
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _scale_positions(raw_positions_arr, out_arr):
+        """
+        Numba version of `_scale_positions_numpy` that scales all four
+        values of each event in a single parallel pass over the rows.
+        """
+        for i in prange(raw_positions_arr.shape[0]):
+            out_arr[i, 0] = (raw_positions_arr[i, 0]/100)*104
+            out_arr[i, 1] = (raw_positions_arr[i, 1]/100)*68
+            out_arr[i, 2] = raw_positions_arr[i, 2]
+            out_arr[i, 3] = (raw_positions_arr[i, 3]/100)*69
+
+        return out_arr
+else:
+    _scale_positions = _scale_positions_numpy
+
+
 def cluster_positions_extractor(
         cluster_events_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -171,7 +448,8 @@ def cluster_positions_extractor(
     cluster_events_df : Pandas DataFrame
         This parameter allows the user to specify the collection of events
         that comprise the sequences that belong to the particular cluster
-        of interest.
+        of interest. These events must either have a `positions` column or
+        the already-parsed `RAW_POSITION_COLS` columns.
 
     Returns
     -------
@@ -190,55 +468,43 @@ def cluster_positions_extractor(
     References
     ----------
     1. https://stackoverflow.com/questions/53218931/how-to-unnest-explode-a-column-in-a-pandas-dataframe
-    2. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.concat.html
-    3. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.html
-    4. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.reset_index.html
-    5. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.rename.html
+    2. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.html
     """
     to_return = None
     # First, validate the input data
     ipv.parameter_type_validator(expected_type=pd.DataFrame,
                                  parameter_var=cluster_events_df)
-    normed = cluster_events_df.reset_index(drop=True)
 
-    # Next, run the above two functions to get starting and ending positions
-    starting_positions_series = normed.apply(
-        func=event_starting_point_extractor, 
-        axis="columns"
-    )
-    starting_positions_df = pd.DataFrame(
-        data=starting_positions_series.tolist(),
-        index=normed.index,
-        columns=["starting_x", "starting_y"]
-    )
-
-    ending_positions_series = normed.swifter.apply(
-        func=event_ending_point_extractor,
-        axis="columns"
-    )
-    ending_positions_df = pd.DataFrame(
-        data=ending_positions_series.tolist(),
-        index=normed.index,
-        columns=["ending_x", "ending_y"]
+    # Next, get the starting and ending positions of every event (which
+    # only have to be parsed if that was not already done by
+    # `raw_positions_loader`) and scale them in the same way as the above
+    # two functions.
+    if set(RAW_POSITION_COLS).issubset(cluster_events_df.columns):
+        raw_positions_arr = cluster_events_df[RAW_POSITION_COLS].to_numpy(
+            dtype=np.float64)
+    else:
+        raw_positions_arr = raw_positions_parser(
+            cluster_events_df["positions"])
+    positions_arr = _scale_positions(
+        raw_positions_arr, np.empty_like(raw_positions_arr)
     )
 
-    # Create the new DataFrame that we will be returning.
-    positions_df = pd.concat(
-        objs=[normed.drop(columns="positions"),
-              starting_positions_df,
-              ending_positions_df],
-        axis="columns",
-        ignore_index=True
+    # Create the new DataFrame that we will be returning. Note that its
+    # columns are taken straight from the arrays of `cluster_events_df`
+    # (with its index, i.e. `seq_id`, as the first column) rather than from
+    # a copy of it made with `reset_index`.
+    positions_df = pd.DataFrame(
+        {cluster_events_df.index.name or "index":
+            cluster_events_df.index.to_numpy(),
+         **{col: cluster_events_df[col].to_numpy()
+            for col in cluster_events_df.columns
+            if col != "positions" and col not in RAW_POSITION_COLS},
+         "starting_x": positions_arr[:, 0],
+         "starting_y": positions_arr[:, 1],
+         "ending_x": positions_arr[:, 2],
+         "ending_y": positions_arr[:, 3]},
+        copy=False
     )
-    positions_df.rename(columns={0 : "seq_id",
-                                 1 : "id",
-                                 2 : "matchId",
-                                 3 : "teamId",
-                                 4 : "starting_x",
-                                 5 : "starting_y",
-                                 6 : "ending_x",
-                                 7 : "ending_y"},
-                        inplace=True)
 
     # Finally, validate and return the result
     ipv.parameter_type_validator(expected_type=pd.DataFrame,
@@ -248,6 +514,26 @@ def cluster_positions_extractor(
     return to_return
 
 
+if njit is not None:
+    @njit(cache=True)
+    def _unit_bin_counts(x_vals, y_vals, bin_counts):
+        """
+        Numba kernel used by `cluster_positions_binning` that adds to
+        `bin_counts` the number of positions in each of its 1-unit wide
+        bins that start at 0. Just as in `np.histogram2d`, positions
+        outside of the bins are ignored and the last bin along each axis
+        includes its right edge.
+        """
+        nbins = bin_counts.shape[0]
+        for i in range(x_vals.size):
+            x_val, y_val = x_vals[i], y_vals[i]
+            if 0 <= x_val <= nbins and 0 <= y_val <= nbins:
+                bin_counts[min(int(x_val), nbins - 1),
+                           min(int(y_val), nbins - 1)] += 1
+
+        return bin_counts
+
+
 def cluster_positions_binning(
         cluster_positions_df: pd.DataFrame, beginning_points=True) -> tuple:
     """
@@ -291,6 +577,7 @@ def cluster_positions_binning(
     References
     ----------
     1. https://numpy.org/doc/stable/reference/generated/numpy.histogram2d.html
+    2. https://numba.readthedocs.io/en/stable/user/jit.html
     """
     to_return = None
     # First, validate the input data
@@ -298,28 +585,48 @@ def cluster_positions_binning(
                                  parameter_var=cluster_positions_df)
 
     # Next, define the variables that we will need for the rest of the
-    # function.
-    field_bins = np.arange(0, 101, 1)
+    # function. Note that the positions are binned as single-precision values since
+    # that precision is more than enough to resolve which 1-unit bin each
+    # position falls in and it halves the amount of data scanned.
+    field_bins = np.arange(0, 101, 1, dtype=np.float32)
 
     x_col = "starting_x" if beginning_points else "ending_x"
-    x_vals = cluster_positions_df[x_col].to_numpy()
+    x_vals = np.ascontiguousarray(
+        cluster_positions_df[x_col].to_numpy(dtype=np.float32)
+    )
 
     y_col = "starting_y" if beginning_points else "ending_y"
-    y_vals = cluster_positions_df[y_col].to_numpy()
+    y_vals = np.ascontiguousarray(
+        cluster_positions_df[y_col].to_numpy(dtype=np.float32)
+    )
 
     # Now we are ready to actually perform the 2D binning.
-    field_bin_counts, xbins, ybins = np.histogram2d(
-        x=x_vals,
-        y=y_vals,
-        bins=field_bins,
-        range=[[0, 100], [0, 100]],
-        density=True
-    )
+    if njit is not None:
+        # If Numba is installed, count the positions in each bin in a single
+        # pass and then normalize the counts in the same way that
+        # `np.histogram2d` does with `density=True` (each bin has an area
+        # of 1).
+        bin_counts = _unit_bin_counts(
+            x_vals,
+            y_vals,
+            np.zeros((field_bins.size - 1, field_bins.size - 1),
+                     dtype=np.int64)
+        )
+        field_bin_counts = bin_counts / bin_counts.sum()
+        xbins, ybins = field_bins, field_bins.copy()
+    else:
+        field_bin_counts, xbins, ybins = np.histogram2d(
+            x=x_vals,
+            y=y_vals,
+            bins=field_bins,
+            range=[[0, 100], [0, 100]],
+            density=True
+        )
 
     # Finally, validate and return the result
-    assert all([isinstance(field_bin_counts, np.ndarray),
-                isinstance(xbins, np.ndarray),
-                isinstance(ybins, np.ndarray)])
+    assert isinstance(field_bin_counts, np.ndarray) \
+        and isinstance(xbins, np.ndarray) \
+        and isinstance(ybins, np.ndarray)
     assert xbins.shape == ybins.shape
     assert field_bin_counts.shape[0] == xbins.size - 1
     assert field_bin_counts.shape[0] == ybins.size - 1
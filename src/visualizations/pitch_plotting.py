@@ -14,32 +14,176 @@ soccer field which helps put the displayed data in its proper soccer context.
 ###################################
 # file access
 import os
+import pickle
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 # data manipulation
-import pandas as pd
+if TYPE_CHECKING:
+    # Pandas is only needed at runtime by the functions that plot clusters,
+    # which import it themselves (see `pitch_positions_cluster_generator`).
+    import pandas as pd
 import numpy as np
+from scipy.ndimage import gaussian_filter
+
+try:
+    from numba import njit, prange
+    from numba import config as numba_config
+except ImportError:
+    # If Numba is not installed, `_binned_kde` (see below) bins the
+    # positions with `np.histogram2d` instead.
+    njit = None
 
 # visualization packages
+import matplotlib
+# When the plots are being generated in a batch (as signaled by the
+# `PITCH_PLOT_BATCH` environment variable) they are only written to disk, so
+# use the non-interactive Agg backend.
+if os.environ.get("PITCH_PLOT_BATCH") == "1":
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.axes import Axes as AXES_TYPE
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure as FIG_TYPE
 
 # custom modules
-from src.visualizations import cluster_bar_chart_prep as cbcp
-from src.visualizations import contour_position_prep as cpp
 from src.test import input_parameter_validation as ipv
 
 # define variables that will be used throughout script
 SCRIPT_DIR = os.path.dirname(__file__)
-
-RANDOM_FIG, RANDOM_AX = plt.subplots()
-RANDOM_FIG.clear()
-FIG_TYPE = type(RANDOM_FIG)
-AXES_TYPE = type(RANDOM_AX)
+PLOT_DIR = Path(
+    SCRIPT_DIR, "../../visualizations/clusters_investigation/kmeans"
+).resolve()
+
+# (x, y) vertices of each of the lines on a horizontal pitch: the side and
+# goal lines, the outer boxes, the goals, the 6 yard boxes, and the halfway
+# line.
+PITCH_LINES_H = [
+    np.array([[0, 0], [104, 0], [104, 68], [0, 68], [0, 0]]),
+    np.array([[104, 13.84], [87.5, 13.84], [87.5, 54.16], [104, 54.16]]),
+    np.array([[0, 13.84], [16.5, 13.84], [16.5, 54.16], [0, 54.16]]),
+    np.array([[104, 30.34], [104.2, 30.34], [104.2, 37.66], [104, 37.66]]),
+    np.array([[0, 30.34], [-0.2, 30.34], [-0.2, 37.66], [0, 37.66]]),
+    np.array([[104, 24.84], [99.5, 24.84], [99.5, 43.16], [104, 43.16]]),
+    np.array([[0, 24.84], [4.5, 24.84], [4.5, 43.16], [0, 43.16]]),
+    np.array([[52, 0], [52, 68]])
+]
+# the same lines on a vertical pitch (which is a horizontal pitch with its x-
+# and y-coordinates swapped).
+PITCH_LINES_V = [line[:, ::-1] for line in PITCH_LINES_H]
+# (x, y) centers and z-orders of the penalty arcs and the center circle on a
+# horizontal pitch.
+PITCH_CIRCLES_H = [((93.5, 34), 1), ((10.5, 34), 1), ((52, 34), 2)]
+# (x, y) lower left corners, widths, and heights of the patches that hide the
+# parts of the penalty arcs inside of the boxes on a horizontal pitch.
+PITCH_BOX_PATCHES_H = [((87.5, 20), 16, 30), ((0, 20), 16.5, 30)]
+
+# size (in metres) of the bins that the cluster positions are counted into
+# when estimating their density (see `_binned_kde`), the number of bins
+# along each side of a horizontal pitch, and the grid of bin centers that
+# the density contours are drawn on.
+KDE_BIN_SIZE = 0.5
+KDE_NUM_X_BINS, KDE_NUM_Y_BINS = int(104 / KDE_BIN_SIZE), int(68 / KDE_BIN_SIZE)
+KDE_MESH_X, KDE_MESH_Y = np.meshgrid(
+    (np.arange(KDE_NUM_X_BINS) + 0.5) * KDE_BIN_SIZE,
+    (np.arange(KDE_NUM_Y_BINS) + 0.5) * KDE_BIN_SIZE
+)
+KDE_MESH_X.flags.writeable = False
+KDE_MESH_Y.flags.writeable = False
+# minimum number of positions that each parallel chunk of `_pitch_bin_counts`
+# counts (so that small clusters do not allocate one histogram per thread).
+KDE_CHUNK_SIZE = 65_536
+
+# fingerprint of the cluster labels, cluster ID, and beginning points flag ->
+# x- and y-coordinates of the events of that cluster (see
+# `_cluster_position_values`).
+CLUSTER_POSITIONS_CACHE = OrderedDict()
+CLUSTER_POSITIONS_CACHE_SIZE = 16
 
 
 ################################
 ### Define Modular Functions ###
 ################################
+def _draw_pitch_markings(pitch_ax, pitch_color: str, lines_color: str,
+                         is_horizontal: bool) -> None:
+    """
+    Draws the soccer pitch described by the parameters of `draw_pitch` onto
+    the `axis` object `pitch_ax`. This is shared by `_pitch_template` and
+    `pitch_positions_clusters_grid` which draws a pitch on every one of its
+    subplots. Every marking is defined on a horizontal pitch and has its
+    coordinates swapped when the pitch is vertical.
+    """
+    def orient(pair):
+        return pair if is_horizontal else pair[::-1]
+
+    x_lims, y_lims = orient(((-1, 105), (-1, 69)))
+    pitch_ax.set_xlim(*x_lims)
+    pitch_ax.set_ylim(*y_lims)
+    pitch_ax.axis('off')  # this hides the x and y ticks
+
+    # side and goal lines, boxes, goals, and halfway line
+    pitch_ax.add_collection(LineCollection(
+        PITCH_LINES_H if is_horizontal else PITCH_LINES_V,
+        colors=lines_color,
+        capstyle="projecting",
+        joinstyle="round",
+        zorder=5
+    ))
+
+    # penalty spots and kickoff spot
+    pitch_ax.plot(*orient(([93, 11, 52], [34, 34, 34])), marker="o",
+                  linestyle="none", color=lines_color, zorder=5)
+
+    # Pitch rectangle
+    pitch_ax.add_artist(plt.Rectangle((-1, -1), *orient((106, 70)), ls='-',
+                                      color=pitch_color, zorder=1, alpha=1))
+
+    circles = [plt.Circle(orient(center),
+                          9.15,
+                          ls='solid',
+                          lw=1.5,
+                          color=lines_color,
+                          fill=False,
+                          zorder=zorder,
+                          alpha=1)
+               for center, zorder in PITCH_CIRCLES_H]
+
+    ## Rectangles in boxes
+    box_patches = [plt.Rectangle(orient(corner), *orient((width, height)),
+                                 ls='-', color=pitch_color, zorder=1, alpha=1)
+                   for corner, width, height in PITCH_BOX_PATCHES_H]
+
+    for artist in circles[:2] + box_patches + circles[2:]:
+        pitch_ax.add_artist(artist)
+
+
+@lru_cache(maxsize=8)
+def _pitch_template(
+        pitch_color: str, lines_color: str, is_horizontal: bool) -> bytes:
+    """
+    Draws the soccer pitch described by the parameters of `draw_pitch` and
+    returns its pickled `figure` object. Since the result is cached,
+    `draw_pitch` only has to unpickle a copy of a pitch it has already
+    drawn instead of drawing it again.
+    """
+    pitch_fig, pitch_ax = plt.subplots(
+        figsize=(10.4, 6.8) if is_horizontal else (6.8, 10.4)
+    )
+    _draw_pitch_markings(pitch_ax, pitch_color, lines_color, is_horizontal)
+
+    # Pickle the pitch and then close it so that only its copies remain
+    # open. Note that since the pitch was created with Pyplot, its copies
+    # are also registered with Pyplot when they are unpickled.
+    pitch_bytes = pickle.dumps(pitch_fig)
+    plt.close(pitch_fig)
+
+    return pitch_bytes
+
+
 def draw_pitch(
         pitch_color="w", lines_color="k",
         pitch_orientation="h") -> (FIG_TYPE, AXES_TYPE):
@@ -105,226 +249,335 @@ def draw_pitch(
     ----------
     1. https://figshare.com/articles/software/Plots_replication_code_of_Nature_Scientific_Data_paper/11473365?backTo=/collections/Soccer_match_event_dataset/4415000
     2. https://matplotlib.org/3.1.0/gallery/color/named_colors.html
+    3. https://matplotlib.org/3.1.1/users/whats_new.html#figure-pickling
     """
     to_return = None
     # First, validate the input data.
-    ipv.parameter_type_validator(expected_type=str,
-                                 parameter_var=pitch_color)
-    ipv.parameter_type_validator(expected_type=str,
-                                 parameter_var=lines_color)
-    ipv.parameter_type_validator(expected_type=str,
-                                 parameter_var=pitch_orientation)
-
-    # Next,
-    if pitch_orientation.lower().startswith("h"):
-        pitch_fig, pitch_ax = plt.subplots(figsize=(10.4, 6.8))
-        plt.xlim(-1, 105)
-        plt.ylim(-1, 69)
-        pitch_ax.axis('off')  # this hides the x and y ticks
-
-        # side and goal lines_colors #
-        ly1 = [0, 0, 68, 68, 0]
-        lx1 = [0, 104, 104, 0, 0]
-
-        plt.plot(lx1, ly1, color=lines_color, zorder=5)
-
-        # boxes, 6 yard box and goals
-        #outer boxes#
-        ly2 = [13.84, 13.84, 54.16, 54.16]
-        lx2 = [104, 87.5, 87.5, 104]
-        plt.plot(lx2, ly2, color=lines_color, zorder=5)
-
-        ly3 = [13.84, 13.84, 54.16, 54.16]
-        lx3 = [0, 16.5, 16.5, 0]
-        plt.plot(lx3, ly3, color=lines_color, zorder=5)
-
-        #goals#
-        ly4 = [30.34, 30.34, 37.66, 37.66]
-        lx4 = [104, 104.2, 104.2, 104]
-        plt.plot(lx4, ly4, color=lines_color, zorder=5)
-
-        ly5 = [30.34, 30.34, 37.66, 37.66]
-        lx5 = [0, -0.2, -0.2, 0]
-        plt.plot(lx5, ly5, color=lines_color, zorder=5)
-
-        #6 yard boxes#
-        ly6 = [24.84, 24.84, 43.16, 43.16]
-        lx6 = [104, 99.5, 99.5, 104]
-        plt.plot(lx6, ly6, color=lines_color, zorder=5)
-
-        ly7 = [24.84, 24.84, 43.16, 43.16]
-        lx7 = [0, 4.5, 4.5, 0]
-        plt.plot(lx7, ly7, color=lines_color, zorder=5)
-
-        # Halfway lines_color, penalty spots, and kickoff spot
-        ly8 = [0, 68]
-        lx8 = [52, 52]
-        plt.plot(lx8, ly8, color=lines_color, zorder=5)
-
-        plt.scatter(93, 34, color=lines_color, zorder=5)
-        plt.scatter(11, 34, color=lines_color, zorder=5)
-        plt.scatter(52, 34, color=lines_color, zorder=5)
-
-        circle1 = plt.Circle((93.5, 34),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=1,
-                             alpha=1)
-        circle2 = plt.Circle((10.5, 34),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=1,
-                             alpha=1)
-        circle3 = plt.Circle((52, 34),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=2,
-                             alpha=1)
-
-        ## Rectangles in boxes
-        rec1 = plt.Rectangle((87.5, 20),
-                             16, 30,
-                             ls='-',
-                             color=pitch_color,
-                             zorder=1,
-                             alpha=1)
-        rec2 = plt.Rectangle((0, 20),
-                             16.5,
-                             30, ls='-',
-                             color=pitch_color,
-                             zorder=1,
-                             alpha=1)
-
-        # Pitch rectangle
-        rec3 = plt.Rectangle((-1, -1),
-                             106, 70,
-                             ls='-',
-                             color=pitch_color,
-                             zorder=1,
-                             alpha=1)
-
-        pitch_ax.add_artist(rec3)
-        pitch_ax.add_artist(circle1)
-        pitch_ax.add_artist(circle2)
-        pitch_ax.add_artist(rec1)
-        pitch_ax.add_artist(rec2)
-        pitch_ax.add_artist(circle3)
-
-    else:
-        pitch_fig, pitch_ax = plt.subplots(figsize=(6.8, 10.4))
-
-        plt.ylim(-1, 105)
-        plt.xlim(-1, 69)
-
-        pitch_ax.axis('off')  # this hides the x and y ticks
-
-        # side and goal lines_colors #
-        lx1 = [0, 0, 68, 68, 0]
-        ly1 = [0, 104, 104, 0, 0]
-
-        plt.plot(lx1, ly1, color=lines_color, zorder=5)
-
-        # boxes, 6 yard box and goals
-
-        #outer boxes#
-        lx2 = [13.84, 13.84, 54.16, 54.16]
-        ly2 = [104, 87.5, 87.5, 104]
-        plt.plot(lx2, ly2, color=lines_color, zorder=5)
-
-        lx3 = [13.84, 13.84, 54.16, 54.16]
-        ly3 = [0, 16.5, 16.5, 0]
-        plt.plot(lx3, ly3, color=lines_color, zorder=5)
-
-        #goals#
-        lx4 = [30.34, 30.34, 37.66, 37.66]
-        ly4 = [104, 104.2, 104.2, 104]
-        plt.plot(lx4, ly4, color=lines_color, zorder=5)
-
-        lx5 = [30.34, 30.34, 37.66, 37.66]
-        ly5 = [0, -0.2, -0.2, 0]
-        plt.plot(lx5, ly5, color=lines_color, zorder=5)
-
-        #6 yard boxes#
-        lx6 = [24.84, 24.84, 43.16, 43.16]
-        ly6 = [104, 99.5, 99.5, 104]
-        plt.plot(lx6, ly6, color=lines_color, zorder=5)
-
-        lx7 = [24.84, 24.84, 43.16, 43.16]
-        ly7 = [0, 4.5, 4.5, 0]
-        plt.plot(lx7, ly7, color=lines_color, zorder=5)
-
-        # Halfway lines_color, penalty spots, and kickoff spot
-        lx8 = [0, 68]
-        ly8 = [52, 52]
-        plt.plot(lx8, ly8, color=lines_color, zorder=5)
-
-        plt.scatter(34, 93, color=lines_color, zorder=5)
-        plt.scatter(34, 11, color=lines_color, zorder=5)
-        plt.scatter(34, 52, color=lines_color, zorder=5)
-
-        circle1 = plt.Circle((34, 93.5),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=1,
-                             alpha=1)
-        circle2 = plt.Circle((34, 10.5),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=1,
-                             alpha=1)
-        circle3 = plt.Circle((34, 52),
-                             9.15,
-                             ls='solid',
-                             lw=1.5,
-                             color=lines_color,
-                             fill=False,
-                             zorder=2,
-                             alpha=1)
-
-        ## Rectangles in boxes
-        rec1 = plt.Rectangle((20, 87.5), 30, 16.5, ls='-',
-                             color=pitch_color, zorder=1, alpha=1)
-        rec2 = plt.Rectangle((20, 0), 30, 16.5, ls='-',
-                             color=pitch_color, zorder=1, alpha=1)
-
-        # Pitch rectangle
-        rec3 = plt.Rectangle((-1, -1), 70, 106, ls='-',
-                             color=pitch_color, zorder=1, alpha=1)
-
-        pitch_ax.add_artist(rec3)
-        pitch_ax.add_artist(circle1)
-        pitch_ax.add_artist(circle2)
-        pitch_ax.add_artist(rec1)
-        pitch_ax.add_artist(rec2)
-        pitch_ax.add_artist(circle3)
+    ipv.parameter_types_validator([
+        (str, pitch_color),
+        (str, lines_color),
+        (str, pitch_orientation)
+    ])
+
+    # Next, make a copy of the pitch with the specified colors and
+    # orientation (which is only drawn the first time it is requested).
+    is_horizontal = pitch_orientation[:1] in ("h", "H")
+    pitch_fig = pickle.loads(
+        _pitch_template(pitch_color, lines_color, is_horizontal)
+    )
+    pitch_ax = pitch_fig.axes[0]
 
     # Finally, validate and return the result
-    ipv.parameter_type_validator(expected_type=FIG_TYPE,
-                                 parameter_var=pitch_fig)
-    ipv.parameter_type_validator(expected_type=AXES_TYPE,
-                                 parameter_var=pitch_ax)
+    assert isinstance(pitch_fig, FIG_TYPE) and isinstance(pitch_ax, AXES_TYPE)
 
     to_return = (pitch_fig, pitch_ax)
     return to_return
 
 
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _pitch_bin_counts(x_vals, y_vals, bin_size, num_x_bins, num_y_bins,
+                          num_chunks):
+        """
+        Numba kernel used by `_binned_kde` that counts the number of
+        positions in each `bin_size` wide bin of the pitch. The positions
+        are split into `num_chunks` chunks that are each counted into their
+        own histogram in parallel before being summed. Just as in
+        `np.histogram2d`, positions off of the pitch are ignored and the last
+        bin along each axis includes its right edge.
+        """
+        chunk_counts = np.zeros((num_chunks, num_x_bins, num_y_bins),
+                                dtype=np.int64)
+        chunk_size = (x_vals.size + num_chunks - 1) // num_chunks
+        x_max, y_max = num_x_bins * bin_size, num_y_bins * bin_size
+        for chunk in prange(num_chunks):
+            stop = min((chunk + 1) * chunk_size, x_vals.size)
+            for i in range(chunk * chunk_size, stop):
+                x_val, y_val = x_vals[i], y_vals[i]
+                if 0 <= x_val <= x_max and 0 <= y_val <= y_max:
+                    chunk_counts[chunk,
+                                 min(int(x_val / bin_size), num_x_bins - 1),
+                                 min(int(y_val / bin_size), num_y_bins - 1)] += 1
+
+        return chunk_counts.sum(axis=0)
+
+
+def _binned_kde(x_vals: np.ndarray, y_vals: np.ndarray):
+    """
+    Purpose
+    -------
+    The purpose of this function is to estimate the 2-dimensional density
+    of a collection of positions on a horizontal pitch. Rather than summing
+    a Gaussian kernel centered at every position for every point of the grid
+    (as `sns.kdeplot` does), the positions are first counted into
+    `KDE_BIN_SIZE` wide bins and the counts are then blurred with a Gaussian
+    filter whose width is given by Scott's rule, which is the same bandwidth
+    that `sns.kdeplot` uses by default.
+
+    Parameters
+    ----------
+    x_vals : Numpy Array
+        This parameter allows the user to specify the x-coordinates of the
+        positions.
+    y_vals : Numpy Array
+        This parameter allows the user to specify the y-coordinates of the
+        positions.
+
+    Returns
+    -------
+    to_return : Numpy Array or Python None object
+        This function returns the estimated density in each bin with one
+        row per y-coordinate so that it lines up with `KDE_MESH_X` and
+        `KDE_MESH_Y`. If there are fewer than 2 distinct positions on the
+        pitch (in which case there is no spread to estimate the kernel
+        width from), `None` is returned instead.
+
+    References
+    ----------
+    1. https://docs.scipy.org/doc/scipy/reference/generated/scipy.ndimage.gaussian_filter.html
+    2. https://numba.readthedocs.io/en/stable/user/parallel.html
+    3. https://en.wikipedia.org/wiki/Kernel_density_estimation#Bandwidth_selection
+    """
+    to_return = None
+    # First, drop the positions that are off of the pitch. These would not be
+    # counted in any bin anyway but they would still widen the kernel.
+    on_pitch = (x_vals >= 0) & (x_vals <= 104) & (y_vals >= 0) & (y_vals <= 68)
+    if not on_pitch.all():
+        # If at least one of the positions is off of the pitch.
+        x_vals, y_vals = x_vals[on_pitch], y_vals[on_pitch]
+
+    if x_vals.size < 2 or (x_vals.min() == x_vals.max()
+                           and y_vals.min() == y_vals.max()):
+        # If there are not at least 2 distinct positions on the pitch.
+        return to_return
+
+    # Next, count the number of positions that fall in each bin.
+    if njit is not None:
+        # If Numba is installed, count the positions in chunks of (at least)
+        # `KDE_CHUNK_SIZE` positions with at most one chunk per available
+        # thread.
+        num_chunks = min(numba_config.NUMBA_NUM_THREADS,
+                         max(1, x_vals.size // KDE_CHUNK_SIZE))
+        bin_counts = _pitch_bin_counts(
+            np.ascontiguousarray(x_vals),
+            np.ascontiguousarray(y_vals),
+            KDE_BIN_SIZE,
+            KDE_NUM_X_BINS,
+            KDE_NUM_Y_BINS,
+            num_chunks
+        )
+    else:
+        bin_counts, _, _ = np.histogram2d(
+            x=x_vals,
+            y=y_vals,
+            bins=[KDE_NUM_X_BINS, KDE_NUM_Y_BINS],
+            range=[[0, 104], [0, 68]]
+        )
+
+    # Now, smooth the counts. Scott's rule gives the standard deviation of
+    # the kernel along each axis which we then convert to a number of bins.
+    scott_factor = x_vals.size ** (-1 / 6)
+    sigma = (max(np.std(x_vals) * scott_factor / KDE_BIN_SIZE, 1e-3),
+             max(np.std(y_vals) * scott_factor / KDE_BIN_SIZE, 1e-3))
+    density = gaussian_filter(bin_counts.astype(np.float64), sigma=sigma,
+                              mode="constant")
+
+    # Finally, return the result.
+    to_return = density.T
+
+    return to_return
+
+
+def _density_levels(density: np.ndarray, num_levels=10,
+                    thresh=0.05) -> np.ndarray:
+    """
+    Purpose
+    -------
+    The purpose of this function is to determine the density values at
+    which the contours of a density plot should be drawn. Just like
+    `sns.kdeplot`, the levels are chosen so that they are evenly spaced in
+    the proportion of the total probability mass that lies outside of them
+    with the lowest contour enclosing `1 - thresh` of the mass.
+
+    Parameters
+    ----------
+    density : Numpy Array
+        This parameter allows the user to specify the estimated density in
+        each bin.
+    num_levels : int
+        This parameter allows the user to specify the number of contour
+        levels.
+
+        This parameter defaults to 10.
+    thresh : float
+        This parameter allows the user to specify the proportion of the
+        probability mass that will lie below the lowest contour level.
+
+        This parameter defaults to 0.05.
+
+    Returns
+    -------
+    to_return : Numpy Array
+        This function returns the increasing density values that can be
+        passed to the `levels` argument of `contourf`.
+
+    References
+    ----------
+    1. https://seaborn.pydata.org/generated/seaborn.kdeplot.html
+    """
+    to_return = None
+    # First, sort the densities from highest to lowest and find the
+    # proportion of the total mass that lies at or above each of them.
+    sorted_density = np.sort(density, axis=None)[::-1]
+    mass_proportions = np.cumsum(sorted_density) / sorted_density.sum()
+
+    # Next, look up the density at each of the mass proportions.
+    iso_proportions = np.linspace(thresh, 1, num_levels, endpoint=False)
+    levels = sorted_density.take(
+        np.searchsorted(mass_proportions, 1 - iso_proportions),
+        mode="clip"
+    )
+
+    # Finally, return the result. The maximum density is used as the top of
+    # the highest level so that the peak of the density is also filled.
+    to_return = np.unique(np.append(levels, sorted_density[0]))
+
+    return to_return
+
+
+def _draw_density_contours(pitch_ax, x_vals: np.ndarray,
+                           y_vals: np.ndarray, cluster_id: int):
+    """
+    Draws the filled contours of the density of the given positions (see
+    `_binned_kde` and `_density_levels`) onto the horizontal pitch
+    `pitch_ax` and returns the resulting contour set. If the positions of
+    the cluster `cluster_id` do not have a density that can be drawn (e.g.,
+    every event starts on the penalty spot), a warning is issued, nothing is
+    drawn, and `None` is returned.
+    """
+    density = _binned_kde(x_vals, y_vals)
+    levels = None if isinstance(density, type(None)) \
+        else _density_levels(density)
+    if isinstance(levels, type(None)) or levels.size < 2:
+        # If there is no spread in the positions to draw contours of.
+        warnings.warn("The events in cluster {} do not have at least 2 "
+                      "distinct positions on the pitch, so no contours are "
+                      "drawn for them.".format(cluster_id))
+        return None
+
+    return pitch_ax.contourf(KDE_MESH_X,
+                             KDE_MESH_Y,
+                             density,
+                             levels=levels,
+                             cmap="Greens")
+
+
+def _cluster_position_values(feat_pred_df: "pd.DataFrame", cluster_id: int,
+                             beginning_points: bool) -> tuple:
+    """
+    Looks up the events of the cluster `cluster_id` in `feat_pred_df` and
+    returns read-only Numpy Arrays of the x- and y-coordinates of either
+    their starting or ending points (as specified by `beginning_points`) as
+    single-precision values, which are more than precise enough to bin them
+    and halve the amount of data that the density estimate has to read. The
+    `CLUSTER_POSITIONS_CACHE_SIZE` most recently used results are cached so
+    that replotting a cluster (e.g., on a pitch with different colors) does
+    not repeat the look-up. The cache is keyed on a fingerprint of the
+    cluster labels (and their index) rather than on the DataFrame itself,
+    so re-assigning the labels of a DataFrame in place is picked up and no
+    DataFrame is kept alive by the cache.
+    """
+    import pandas as pd
+
+    labels_fingerprint = blake2b(
+        pd.util.hash_pandas_object(feat_pred_df["predicted_cluster_id"],
+                                   index=True).to_numpy().tobytes(),
+        digest_size=16
+    ).hexdigest()
+    cache_key = (labels_fingerprint, cluster_id, beginning_points)
+
+    if cache_key in CLUSTER_POSITIONS_CACHE:
+        # If these positions have already been looked up, mark them as the
+        # most recently used ones.
+        CLUSTER_POSITIONS_CACHE.move_to_end(cache_key)
+        return CLUSTER_POSITIONS_CACHE[cache_key]
+
+    # See `pitch_positions_cluster_generator` for why these are imported here
+    # (and only once the cache has been missed).
+    from src.visualizations import cluster_bar_chart_prep as cbcp
+    from src.visualizations import contour_position_prep as cpp
+
+    cluster_events_df = cbcp.cluster_events_extractor(
+        feat_pred_df=feat_pred_df,
+        cluster_id=cluster_id,
+        col1="id",
+        col2="matchId",
+        col3="teamId",
+        col4="starting_x_raw",
+        col5="starting_y_raw",
+        col6="ending_x_raw",
+        col7="ending_y_raw"
+    )
+    cluster_positions_df = cpp.cluster_positions_extractor(cluster_events_df)
+
+    x_col, y_col = ("starting_x", "starting_y") if beginning_points \
+        else ("ending_x", "ending_y")
+    x_vals = np.ascontiguousarray(
+        cluster_positions_df[x_col].to_numpy(dtype=np.float32)
+    )
+    y_vals = np.ascontiguousarray(
+        cluster_positions_df[y_col].to_numpy(dtype=np.float32)
+    )
+    x_vals.flags.writeable = False
+    y_vals.flags.writeable = False
+
+    if len(CLUSTER_POSITIONS_CACHE) >= CLUSTER_POSITIONS_CACHE_SIZE:
+        # Evict the least recently used positions.
+        CLUSTER_POSITIONS_CACHE.popitem(last=False)
+    CLUSTER_POSITIONS_CACHE[cache_key] = (x_vals, y_vals)
+
+    return x_vals, y_vals
+
+
+def _save_cluster_figure(cluster_fig: FIG_TYPE, contour_sets: list,
+                         file_name) -> None:
+    """
+    Writes a figure made by `pitch_positions_cluster_generator` or
+    `pitch_positions_clusters_grid` to the file `file_name` in `PLOT_DIR`
+    (adding a `.png` suffix if it has none) and then closes it. The filled
+    contours in `contour_sets` are stored as images rather than as vector
+    polygons. A ValueError is raised if `file_name` is `None`.
+    """
+    if isinstance(file_name, type(None)):
+        # If the user did not specify the file to save the figure to.
+        err_msg = ("The user has specified that they would like the figure "
+                   "generated by this function to be saved. When this is "
+                   "done, the user must pass in the name of the file that "
+                   "the figure will be written to. This has not been done in "
+                   "this function call. Please do so.")
+        raise ValueError(err_msg)
+
+    save_path = PLOT_DIR / file_name
+    if not save_path.suffix:
+        # If the user did not specify the format of the file.
+        save_path = save_path.with_suffix(".png")
+
+    # Note that newer versions of Matplotlib (3.8+) draw each contour set as
+    # a single collection.
+    for contour_set in contour_sets:
+        for collection in getattr(contour_set, "collections", [contour_set]):
+            collection.set_rasterized(True)
+
+    PLOT_DIR.mkdir(parents=True, exist_ok=True)
+    cluster_fig.savefig(save_path, dpi=150, bbox_inches="tight")
+
+    # Release the saved figure from Pyplot so that figures do not pile up
+    # when many of them are saved in a loop.
+    plt.close(cluster_fig)
+
+
 def pitch_positions_cluster_generator(
-        feat_pred_df: pd.DataFrame, cluster_id: int,
+        feat_pred_df: "pd.DataFrame", cluster_id: int,
         pitch_plot_objs=None, beginning_points=True, 
         save_plot=False, **kwargs) -> tuple:
     """
@@ -354,7 +607,9 @@ def pitch_positions_cluster_generator(
         interest or a contour plot of all of their ending points.
     save_plot : Boolean
         This argument allows the user to specify whether or not the function
-        will save the plot that it generates.
+        will save the plot that it generates. A saved figure is not
+        displayed and is closed (i.e., released from Pyplot) once it has
+        been written to disk.
 
         This parameter defaults to `False`.
     **kwargs : dict
@@ -381,67 +636,42 @@ def pitch_positions_cluster_generator(
     ----------
     1. https://matplotlib.org/3.1.1/api/_as_gen/matplotlib.pyplot.contour.html
     2. https://numpy.org/doc/stable/reference/generated/numpy.meshgrid.html
-    3. https://seaborn.pydata.org/generated/seaborn.kdeplot.html
     """
     to_return = None
+    # Note that pandas and the cluster data modules (the latter of which load
+    # all of the sequence data) are only imported once they are needed so
+    # that importing this script to draw a pitch stays cheap.
+    import pandas as pd
+
     # First, validate the input data.
-    ipv.parameter_type_validator(expected_type=pd.DataFrame,
-                                 parameter_var=feat_pred_df)
-    ipv.parameter_type_validator(expected_type=int,
-                                 parameter_var=cluster_id)
-    ipv.parameter_type_validator(expected_type=(tuple, type(None)),
-                                 parameter_var=pitch_plot_objs)
-    ipv.parameter_type_validator(expected_type=bool,
-                                 parameter_var=beginning_points)
+    type_specs = [
+        (pd.DataFrame, feat_pred_df),
+        (int, cluster_id),
+        ((tuple, type(None)), pitch_plot_objs),
+        (bool, beginning_points)
+    ]
+    if not isinstance(pitch_plot_objs, type(None)):
+        # If the user passed in their own figure and axis objects, check
+        # them in the same call.
+        pitch_fig, pitch_ax = pitch_plot_objs
+        type_specs += [(FIG_TYPE, pitch_fig), (AXES_TYPE, pitch_ax)]
+    ipv.parameter_types_validator(type_specs)
 
     # Next, define any variable that we will need later on in the function
     if isinstance(pitch_plot_objs, type(None)):
         # If the user is using the default value for this parameter.
         pitch_fig, pitch_ax = draw_pitch()
-    else:
-        pitch_fig, pitch_ax = pitch_plot_objs
-        ipv.parameter_type_validator(expected_type=RANDOM_FIG,
-                                     parameter_var=pitch_fig)
-        ipv.parameter_type_validator(expected_type=RANDOM_AX,
-                                     parameter_var=pitch_ax)
 
     # Now, let's obtain the data that we will need to generate the contour
     # plots.
-    cluster_events_df = cbcp.cluster_events_extractor(
-        feat_pred_df=feat_pred_df,
-        cluster_id=cluster_id,
-        col1="id",
-        col2="positions",
-        col3="matchId",
-        col4="teamId"
-    )
-
-    cluster_positions_df = cpp.cluster_positions_extractor(cluster_events_df)
-
-    field_bin_counts, x_bins, y_bins = cpp.cluster_positions_binning(
-        cluster_positions_df=cluster_positions_df,
-        beginning_points=beginning_points
-    )
-
-    mesh_x, mesh_y = np.meshgrid(x_bins, y_bins)
+    x_vals, y_vals = _cluster_position_values(feat_pred_df,
+                                              cluster_id,
+                                              beginning_points)
 
     # We are now finally ready to generate and display the contour plot.
-    num_pts_to_sample = 250_000
-    if cluster_positions_df.shape[0] > num_pts_to_sample:
-        # If the data has so much data that it will take forever to
-        # generate the contour plot of interest.
-        sampled_pos_df = cluster_positions_df.sample(num_pts_to_sample)
-    else:
-        sampled_pos_df = cluster_positions_df
-        
-    sns.kdeplot(sampled_pos_df["starting_x"].to_numpy(),
-                sampled_pos_df["starting_y"].to_numpy(), 
-                fill=True,
-                cmap="Greens",
-                cbar=False,
-                common_norm=True,
-                clip=[[0, 104], [0, 68]])
-    
+    contour_set = _draw_density_contours(pitch_ax, x_vals, y_vals,
+                                         cluster_id)
+
     pitch_ax.set_title(
         label="2D Spatial Distribution of Events in Cluster {}".format(cluster_id),
         fontdict={"fontsize": 22},
@@ -451,35 +681,175 @@ def pitch_positions_cluster_generator(
     pitch_fig.set_figheight(13)
     pitch_fig.set_figwidth(20)
 
-    pitch_fig.show()
+    if not save_plot:
+        # If the figure is only being displayed rather than written to disk.
+        pitch_fig.show()
+    else:
+        contour_sets = [] if isinstance(contour_set, type(None)) \
+            else [contour_set]
+        _save_cluster_figure(pitch_fig, contour_sets,
+                             kwargs.get("file_name", None))
 
-    if save_plot:
-        # If the user would like to save the resulting figure.
-        plot_dir = os.path.join(
-            SCRIPT_DIR, 
-            "../../visualizations/clusters_investigation/kmeans"
-        )
+    # Finally, validate and return the result.
+    to_return = (pitch_fig, pitch_ax)
+
+    return to_return
+
+
+def pitch_positions_clusters_grid(
+        feat_pred_df: "pd.DataFrame", cluster_ids: list, ncols=4,
+        beginning_points=True, save_plot=False, **kwargs) -> tuple:
+    """
+    Purpose
+    -------
+    The purpose of this function is to generate the same contour map that
+    `pitch_positions_cluster_generator` generates for several clusters at
+    once, with each cluster getting its own soccer pitch in a grid of
+    subplots on a single figure. The events of all of the clusters are
+    looked up in the sequence data together and then split up by cluster.
 
-        file_name = kwargs.get("file_name", None)
-        try:
-            assert not isinstance(file_name, type(None))
-        except BaseException:
-            err_msg = "The user has specified that they would like the\
-            subplot generated by this function to be saved. When this is\
-            done, the user must pass in the name of the file that the subplot\
-            image will be written to. This is has not been done in this\
-            function call. Please do so."
+    Parameters
+    ----------
+    feat_pred_df : pd.DataFrame
+        Short for feature-prediction dataframe, this argument allows the
+        user to specify the entire collection of events and set piece
+        sequences that we have data for.
+    cluster_ids : list
+        This argument allows the user to specify the IDs of the clusters
+        that we would like to generate contour maps for. The subplots are
+        filled in the order that the IDs are given in.
+    ncols : int
+        This argument allows the user to specify the number of columns in
+        the grid of subplots.
+
+        This parameter defaults to 4.
+    beginning_points : bool
+        This argument allows the user to specify whether or not they want
+        contour plots of the beginning points for all of the events of
+        interest or contour plots of all of their ending points.
+
+        This parameter defaults to `True`.
+    save_plot : Boolean
+        This argument allows the user to specify whether or not the function
+        will save the plot that it generates. A saved figure is not
+        displayed and is closed (i.e., released from Pyplot) once it has
+        been written to disk.
+
+        This parameter defaults to `False`.
+    **kwargs : dict
+        This function allows for keyword arguments. The current version
+        only acts on the `file_name` keyword argument; this specific
+        keyword argument allows the user to specify the name of the file
+        that they would like to write the generated figure to.
+
+    Returns
+    -------
+    to_return : Python tuple
+        This function returns a tuple that contains the Matplotlib `fig`
+        object and the 2-dimensional Numpy Array of `axis` objects that
+        display the contour plots overlaid on soccer pitches.
 
-            print(err_msg)
-            raise ValueError
+    Raises
+    ------
+    ValueError
+        This error is raised when the user, for at least one parameter,
+        passes in an object whose type is not among the accepted types
+        for that parameter. It is also raised when `cluster_ids` is empty
+        or when the user would like to save the figure but has not
+        specified the name of the file.
 
-        if "." not in file_name:
-            file_name += ".png"
+    References
+    ----------
+    1. https://matplotlib.org/3.1.1/api/_as_gen/matplotlib.pyplot.subplots.html
+    2. https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.core.groupby.GroupBy.indices.html
+    """
+    to_return = None
+    # See `pitch_positions_cluster_generator` for why pandas is imported
+    # here.
+    import pandas as pd
 
-        pitch_fig.savefig("{}/{}".format(plot_dir, file_name), 
-                          bbox_inches="tight")
+    # First, validate the input data.
+    ipv.parameter_types_validator([
+        (pd.DataFrame, feat_pred_df),
+        (list, cluster_ids),
+        (int, ncols),
+        (bool, beginning_points)
+    ])
+    ipv.parameter_types_validator([(int, cluster_id)
+                                   for cluster_id in cluster_ids])
+    if len(cluster_ids) == 0:
+        # If the user did not specify any clusters to plot.
+        err_msg = ("The user must specify the ID of at least one cluster to "
+                   "plot. An empty list was passed to the `cluster_ids` "
+                   "parameter.")
+        raise ValueError(err_msg)
+
+    # Next, look up the events of all of the clusters of interest at once
+    # and find which of these events belong to each cluster. Note that the
+    # cluster data modules are only imported once the input data is known to
+    # be valid since importing them loads all of the sequence data.
+    from src.visualizations import cluster_bar_chart_prep as cbcp
+    from src.visualizations import contour_position_prep as cpp
+
+    cluster_labels = feat_pred_df.predicted_cluster_id
+    grid_labels = cluster_labels[cluster_labels.isin(cluster_ids)]
+
+    grid_events_df = cbcp.SEQUENCES_DF.loc[
+        grid_labels.index.to_numpy(),
+        ["id", "matchId", "teamId"] + cpp.RAW_POSITION_COLS
+    ]
+    grid_positions_df = cpp.cluster_positions_extractor(grid_events_df)
+
+    x_col, y_col = ("starting_x", "starting_y") if beginning_points \
+        else ("ending_x", "ending_y")
+    x_vals = grid_positions_df[x_col].to_numpy(dtype=np.float32)
+    y_vals = grid_positions_df[y_col].to_numpy(dtype=np.float32)
+
+    event_labels = grid_labels.reindex(grid_events_df.index).to_numpy()
+    cluster_event_indicies = grid_positions_df.groupby(event_labels).indices
+
+    # Now, draw a pitch and the contour map of each cluster onto its own
+    # subplot.
+    nrows = -(-len(cluster_ids) // ncols)
+    grid_fig, grid_axs = plt.subplots(nrows, ncols,
+                                      figsize=(5.2 * ncols, 3.6 * nrows),
+                                      squeeze=False)
+    contour_sets = []
+    for plot_num, grid_ax in enumerate(grid_axs.flat):
+        if plot_num >= len(cluster_ids):
+            # If there are no clusters left to plot on this subplot.
+            grid_ax.axis("off")
+            continue
+
+        cluster_id = cluster_ids[plot_num]
+        _draw_pitch_markings(grid_ax, "white", "black", True)
+
+        event_indicies = cluster_event_indicies.get(
+            cluster_id, np.empty(0, dtype=np.intp)
+        )
+        contour_set = _draw_density_contours(grid_ax,
+                                             x_vals[event_indicies],
+                                             y_vals[event_indicies],
+                                             cluster_id)
+        if not isinstance(contour_set, type(None)):
+            # If the cluster had a density to draw.
+            contour_sets.append(contour_set)
+
+        grid_ax.set_title(label="Cluster {}".format(cluster_id),
+                          fontdict={"fontsize": 14},
+                          loc="center")
+
+    grid_fig.suptitle("2D Spatial Distribution of Events by Cluster",
+                      fontsize=22)
+
+    if not save_plot:
+        # If the figure is only being displayed rather than written to disk.
+        grid_fig.show()
+    else:
+        _save_cluster_figure(grid_fig, contour_sets,
+                             kwargs.get("file_name", None))
 
-    # Finally, validate and return the result.
-    to_return = (pitch_fig, pitch_ax)
+    # Finally, return the result.
+    to_return = (grid_fig, grid_axs)
 
     return to_return